@@ -5,6 +5,7 @@ Contains the conversational AI agent logic.
 """
 
 from .orchestrator import AgentOrchestrator
-from .context import ConversationContext
+from .context import ConversationContext, Message
+from .store import RedisContextStore
 
-__all__ = ["AgentOrchestrator", "ConversationContext"]
+__all__ = ["AgentOrchestrator", "ConversationContext", "Message", "RedisContextStore"]
@@ -4,9 +4,82 @@ Context management for the conversational agent.
 Maintains conversation history and user context.
 """
 
-from typing import List, Dict, Any
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Deque, List, Dict, Any, Optional
 from datetime import datetime
 from src.utils.logger import app_logger
+from src.utils.clock import cached_iso_now
+
+
+# Invariant part of the system prompt, built once at import time
+_STATIC_PROMPT_HEADER = """You are StockAdvisor+, an intelligent financial advisor chatbot.
+
+Your role is to:
+1. Analyze stock market data and provide investment insights
+2. Retrieve and analyze financial news
+3. Generate recommendations based on technical and sentiment analysis
+4. Maintain a conversational and helpful tone
+
+Available Tools:
+- analyze_stock(symbol): Get complete analysis of a stock
+- compare_stocks(symbols): Compare multiple stocks
+- get_market_news(limit): Get market news and sentiment
+
+Guidelines:
+- Always provide data-driven recommendations
+- Explain your analysis in simple terms
+- Ask clarifying questions if needed
+- Remind users that this is not financial advice
+- Be honest about limitations and uncertainties"""
+
+
+@dataclass(slots=True)
+class Message:
+    """
+    A single conversation message.
+    
+    Slotted to avoid a per-message __dict__; roles are interned so every
+    message shares the same 'user'/'assistant' string objects.
+    """
+    role: str
+    content: str
+    timestamp: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert message to dictionary.
+        
+        Returns:
+            Dictionary representation of the message
+        """
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "metadata": self.metadata
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """
+        Rebuild a message from its dictionary representation.
+        
+        Args:
+            data: Dictionary produced by to_dict()
+        
+        Returns:
+            Restored message
+        """
+        return cls(
+            sys.intern(data["role"]),
+            data["content"],
+            data["timestamp"],
+            data.get("metadata") or {}
+        )
 
 
 class ConversationContext:
@@ -26,9 +99,12 @@ class ConversationContext:
         """
         self.user_id = user_id
         self.max_history = max_history
-        self.messages: List[Dict[str, Any]] = []
+        self.messages: Deque[Message] = deque(maxlen=max_history)
         self.user_preferences: Dict[str, Any] = {}
+        self.session_summary: str = ""
+        self.turns_since_summary = 0
         self.watched_stocks: List[str] = []
+        self._watched_stocks_str: Optional[str] = None
         self.created_at = datetime.now()
         self.last_activity = datetime.now()
     
@@ -41,23 +117,15 @@ class ConversationContext:
             content: Message content
             metadata: Optional metadata about the message
         """
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "metadata": metadata or {}
-        }
+        message = Message(sys.intern(role), content, cached_iso_now(), metadata or {})
         
+        # The deque's maxlen drops the oldest message once the cap is reached
         self.messages.append(message)
         self.last_activity = datetime.now()
         
-        # Keep only recent messages
-        if len(self.messages) > self.max_history:
-            self.messages = self.messages[-self.max_history:]
-        
-        app_logger.debug(f"Message added for user {self.user_id}: {role}")
+        app_logger.debug("Message added for user %s: %s", self.user_id, role)
     
-    def get_conversation_history(self, limit: int = None) -> List[Dict[str, Any]]:
+    def get_conversation_history(self, limit: int = None) -> List[Message]:
         """
         Get conversation history.
         
@@ -68,8 +136,9 @@ class ConversationContext:
             List of messages
         """
         if limit:
-            return self.messages[-limit:]
-        return self.messages
+            start = max(0, len(self.messages) - limit)
+            return list(islice(self.messages, start, len(self.messages)))
+        return list(self.messages)
     
     def get_system_prompt(self) -> str:
         """
@@ -78,36 +147,18 @@ class ConversationContext:
         Returns:
             System prompt with context
         """
-        watched_stocks_str = ", ".join(self.watched_stocks) if self.watched_stocks else "None"
+        if self._watched_stocks_str is None:
+            self._watched_stocks_str = ", ".join(self.watched_stocks) if self.watched_stocks else "None"
         
-        prompt = f"""You are StockAdvisor+, an intelligent financial advisor chatbot.
-
-Your role is to:
-1. Analyze stock market data and provide investment insights
-2. Retrieve and analyze financial news
-3. Generate recommendations based on technical and sentiment analysis
-4. Maintain a conversational and helpful tone
+        return f"""{_STATIC_PROMPT_HEADER}
 
 User Profile:
 - User ID: {self.user_id}
-- Watched Stocks: {watched_stocks_str}
+- Watched Stocks: {self._watched_stocks_str}
 - Preferences: {self.user_preferences}
 
-Available Tools:
-- analyze_stock(symbol): Get complete analysis of a stock
-- compare_stocks(symbols): Compare multiple stocks
-- get_market_news(limit): Get market news and sentiment
-
-Guidelines:
-- Always provide data-driven recommendations
-- Explain your analysis in simple terms
-- Ask clarifying questions if needed
-- Remind users that this is not financial advice
-- Be honest about limitations and uncertainties
-
-Current Date/Time: {datetime.now().isoformat()}
+Current Date/Time: {cached_iso_now()}
 """
-        return prompt
     
     def add_watched_stock(self, symbol: str):
         """
@@ -118,7 +169,8 @@ Current Date/Time: {datetime.now().isoformat()}
         """
         if symbol.upper() not in self.watched_stocks:
             self.watched_stocks.append(symbol.upper())
-            app_logger.info(f"Added {symbol} to watched stocks for user {self.user_id}")
+            self._watched_stocks_str = None
+            app_logger.info("Added %s to watched stocks for user %s", symbol, self.user_id)
     
     def remove_watched_stock(self, symbol: str):
         """
@@ -129,7 +181,8 @@ Current Date/Time: {datetime.now().isoformat()}
         """
         if symbol.upper() in self.watched_stocks:
             self.watched_stocks.remove(symbol.upper())
-            app_logger.info(f"Removed {symbol} from watched stocks for user {self.user_id}")
+            self._watched_stocks_str = None
+            app_logger.info("Removed %s from watched stocks for user %s", symbol, self.user_id)
     
     def set_preference(self, key: str, value: Any):
         """
@@ -140,7 +193,7 @@ Current Date/Time: {datetime.now().isoformat()}
             value: Preference value
         """
         self.user_preferences[key] = value
-        app_logger.debug(f"Set preference {key}={value} for user {self.user_id}")
+        app_logger.debug("Set preference %s=%s for user %s", key, value, self.user_id)
     
     def get_preference(self, key: str, default: Any = None) -> Any:
         """
@@ -157,8 +210,8 @@ Current Date/Time: {datetime.now().isoformat()}
     
     def clear_history(self):
         """Clear conversation history."""
-        self.messages = []
-        app_logger.info(f"Cleared conversation history for user {self.user_id}")
+        self.messages.clear()
+        app_logger.info("Cleared conversation history for user %s", self.user_id)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -169,9 +222,33 @@ Current Date/Time: {datetime.now().isoformat()}
         """
         return {
             "user_id": self.user_id,
-            "messages": self.messages,
+            "max_history": self.max_history,
+            "messages": [message.to_dict() for message in self.messages],
             "user_preferences": self.user_preferences,
             "watched_stocks": self.watched_stocks,
+            "session_summary": self.session_summary,
+            "turns_since_summary": self.turns_since_summary,
             "created_at": self.created_at.isoformat(),
             "last_activity": self.last_activity.isoformat()
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationContext":
+        """
+        Rebuild a context from its dictionary representation.
+        
+        Args:
+            data: Dictionary produced by to_dict()
+        
+        Returns:
+            Restored conversation context
+        """
+        context = cls(data["user_id"], data.get("max_history", 50))
+        context.messages.extend(Message.from_dict(m) for m in data.get("messages", []))
+        context.user_preferences = data.get("user_preferences", {})
+        context.watched_stocks = data.get("watched_stocks", [])
+        context.session_summary = data.get("session_summary", "")
+        context.turns_since_summary = data.get("turns_since_summary", 0)
+        context.created_at = datetime.fromisoformat(data["created_at"])
+        context.last_activity = datetime.fromisoformat(data["last_activity"])
+        return context
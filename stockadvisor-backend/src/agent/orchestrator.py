@@ -4,13 +4,161 @@ Agent orchestrator for StockAdvisor+ Bot.
 Manages the AI agent logic and tool execution.
 """
 
-import json
+import asyncio
 import re
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+import orjson
 from src.utils.logger import app_logger
+from src.utils.config import config
 from src.ollama.client import OllamaClient
 from src.mcp.server import MCPServer
 from src.agent.context import ConversationContext
+from src.agent.store import RedisContextStore
+
+
+# Tool definitions offered to the LLM through Ollama's native tool calling
+_TOOL_DEFINITIONS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "analyze_stock",
+            "description": "Perform complete analysis of a stock (technical + sentiment)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "symbol": {
+                        "type": "string",
+                        "description": "Stock ticker symbol (e.g., 'AAPL', 'MSFT')"
+                    }
+                },
+                "required": ["symbol"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_stocks",
+            "description": "Compare multiple stocks side by side",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "symbols": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of stock ticker symbols"
+                    }
+                },
+                "required": ["symbols"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_market_news",
+            "description": "Get general market news and sentiment",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of articles (default: 20)"
+                    }
+                }
+            }
+        }
+    }
+]
+
+# Tool-call patterns, compiled once instead of on every LLM turn
+_ANALYZE_RE = re.compile(r'analyze_stock\((.*?)\)')
+_COMPARE_RE = re.compile(r'compare_stocks\(\[(.*?)\]\)')
+_NEWS_RE = re.compile(r'get_market_news\((.*?)\)')
+
+# MCP tool results carry numpy price columns; naive datetimes are taken as UTC
+_TOOL_RESULT_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+# A tool call ready to run: (label shown in tools_used, tool name, arguments)
+ToolCall = Tuple[str, str, Dict[str, Any]]
+
+
+def _unquote(value: str) -> str:
+    """Strip whitespace and surrounding quotes from a tool argument."""
+    return value.strip().strip('"').strip("'")
+
+
+def _analyze_stock_call(mcp: MCPServer, arguments: Dict[str, Any]):
+    """Build the analyze_stock call from its arguments, if they are valid."""
+    symbol = arguments.get("symbol")
+    if not isinstance(symbol, str) or not _unquote(symbol):
+        return None
+    
+    symbol = _unquote(symbol)
+    return f"analyze_stock_{symbol}", mcp.analyze_stock(symbol)
+
+
+def _compare_stocks_call(mcp: MCPServer, arguments: Dict[str, Any]):
+    """Build the compare_stocks call from its arguments, if they are valid."""
+    symbols = arguments.get("symbols")
+    # Models sometimes send the list as one comma-separated string
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    if not isinstance(symbols, list):
+        return None
+    
+    symbols = [symbol for symbol in (_unquote(str(s)) for s in symbols) if symbol]
+    if not symbols:
+        return None
+    return "compare_stocks", mcp.compare_stocks(symbols)
+
+
+def _get_market_news_call(mcp: MCPServer, arguments: Dict[str, Any]):
+    """Build the get_market_news call from its arguments."""
+    # Honour the limit the LLM asked for, otherwise use the API default
+    limit = arguments.get("limit")
+    if isinstance(limit, str) and _unquote(limit).isdigit():
+        limit = int(_unquote(limit))
+    
+    if isinstance(limit, int) and not isinstance(limit, bool) and limit > 0:
+        return "market_news", mcp.get_market_news(limit)
+    return "market_news", mcp.get_market_news()
+
+
+def _parse_analyze_stock(tool: str) -> Optional[Dict[str, Any]]:
+    """Extract analyze_stock arguments from a tool string, if it parses."""
+    match = _ANALYZE_RE.search(tool)
+    return {"symbol": match.group(1)} if match else None
+
+
+def _parse_compare_stocks(tool: str) -> Optional[Dict[str, Any]]:
+    """Extract compare_stocks arguments from a tool string, if it parses."""
+    match = _COMPARE_RE.search(tool)
+    return {"symbols": match.group(1)} if match else None
+
+
+def _parse_get_market_news(tool: str) -> Optional[Dict[str, Any]]:
+    """Extract get_market_news arguments from a tool string."""
+    match = _NEWS_RE.search(tool)
+    return {"limit": match.group(1)} if match else {}
+
+
+# Tool name -> builder returning (result key, awaitable) for validated
+# arguments, or None when the arguments cannot be used
+_TOOL_BUILDERS = {
+    "analyze_stock": _analyze_stock_call,
+    "compare_stocks": _compare_stocks_call,
+    "get_market_news": _get_market_news_call,
+}
+
+# Tool name -> parser turning a tool string into arguments for its builder
+_TOOL_PARSERS = {
+    "analyze_stock": _parse_analyze_stock,
+    "compare_stocks": _parse_compare_stocks,
+    "get_market_news": _parse_get_market_news,
+}
 
 
 class AgentOrchestrator:
@@ -20,19 +168,31 @@ class AgentOrchestrator:
     Manages conversation flow, tool calling, and response generation.
     """
     
-    def __init__(self, ollama_client: OllamaClient, mcp_server: MCPServer):
+    def __init__(
+        self,
+        ollama_client: OllamaClient,
+        mcp_server: MCPServer,
+        context_store: Optional[RedisContextStore] = None
+    ):
         """
         Initialize the agent orchestrator.
         
         Args:
             ollama_client: Ollama LLM client
             mcp_server: MCP server with tools
+            context_store: Optional shared store; contexts stay in memory when omitted
         """
         self.ollama = ollama_client
         self.mcp = mcp_server
-        self.contexts: Dict[str, ConversationContext] = {}
+        self.context_store = context_store
+        # Kept in least-recently-used order so the oldest user is evicted first
+        self.contexts: "OrderedDict[str, ConversationContext]" = OrderedDict()
+        self.max_contexts = config.CONTEXT_MAX_USERS
+        self.context_idle_timeout = config.CONTEXT_IDLE_TIMEOUT
+        # Strong references to fire-and-forget tasks so they are not collected early
+        self._background_tasks = set()
     
-    def get_or_create_context(self, user_id: str) -> ConversationContext:
+    async def get_or_create_context(self, user_id: str) -> ConversationContext:
         """
         Get or create conversation context for user.
         
@@ -42,11 +202,62 @@ class AgentOrchestrator:
         Returns:
             Conversation context
         """
-        if user_id not in self.contexts:
-            self.contexts[user_id] = ConversationContext(user_id)
-            app_logger.info(f"Created new context for user {user_id}")
+        if self.context_store is not None:
+            # The shared store is authoritative so any replica can serve the user
+            context = await self.context_store.load(user_id)
+            if context is None:
+                context = ConversationContext(user_id)
+                app_logger.info("Created new context for user %s", user_id)
+            return context
+        
+        context = self.contexts.get(user_id)
         
-        return self.contexts[user_id]
+        if context is None:
+            context = ConversationContext(user_id)
+            self.contexts[user_id] = context
+            app_logger.info("Created new context for user %s", user_id)
+            
+            if len(self.contexts) > self.max_contexts:
+                evicted_id, _ = self.contexts.popitem(last=False)
+                app_logger.info("Evicted least recently used context for user %s", evicted_id)
+        else:
+            self.contexts.move_to_end(user_id)
+        
+        return context
+    
+    def evict_idle_contexts(self) -> int:
+        """
+        Drop contexts whose last activity is older than the idle timeout.
+        
+        Returns:
+            Number of evicted contexts
+        """
+        cutoff = datetime.now() - timedelta(seconds=self.context_idle_timeout)
+        idle_users = [
+            user_id for user_id, context in self.contexts.items()
+            if context.last_activity < cutoff
+        ]
+        
+        for user_id in idle_users:
+            del self.contexts[user_id]
+        
+        if idle_users:
+            app_logger.info("Evicted %s idle contexts", len(idle_users))
+        
+        return len(idle_users)
+    
+    async def run_context_eviction(self, interval: int = None):
+        """
+        Periodically evict idle contexts until cancelled.
+        
+        Args:
+            interval: Seconds between sweeps (default from config)
+        """
+        interval = interval or config.CONTEXT_EVICTION_INTERVAL
+        
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle_contexts()
     
     async def process_message(
         self,
@@ -64,21 +275,7 @@ class AgentOrchestrator:
             Response with analysis and recommendations
         """
         try:
-            context = self.get_or_create_context(user_id)
-            
-            # Add user message to history
-            context.add_message("user", message)
-            
-            app_logger.info(f"Processing message from user {user_id}: {message[:50]}...")
-            
-            # Get system prompt with context
-            system_prompt = context.get_system_prompt()
-            
-            # Get conversation history for context
-            history = context.get_conversation_history(limit=10)
-            
-            # Format conversation for Ollama
-            messages_text = self._format_messages_for_llm(history)
+            context, system_prompt, messages_text = await self._prepare_turn(user_id, message)
             
             # Generate response with tool calling
             response = await self._generate_response_with_tools(
@@ -87,8 +284,7 @@ class AgentOrchestrator:
                 message
             )
             
-            # Add assistant response to history
-            context.add_message("assistant", response["text"], response.get("metadata"))
+            await self._finish_turn(context, response["text"], response.get("metadata"))
             
             return {
                 "success": True,
@@ -99,20 +295,160 @@ class AgentOrchestrator:
             }
         
         except Exception as e:
-            app_logger.error(f"Error processing message: {str(e)}")
+            app_logger.error("Error processing message: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    async def _generate_response_with_tools(
+    async def process_message_stream(
         self,
+        user_id: str,
+        message: str
+    ) -> AsyncIterator[str]:
+        """
+        Process user message and stream the generated response.
+        
+        The text of the first reply is streamed as it is generated; when the
+        model calls tools, they run and the final answer is streamed after it.
+        The full text is stored in the history once the stream ends.
+        
+        Args:
+            user_id: User identifier
+            message: User message
+        
+        Yields:
+            Response text chunks as they are generated
+        """
+        context, system_prompt, messages_text = await self._prepare_turn(user_id, message)
+        
+        # Filled with analysis and metadata once the tool calls are known
+        response: Dict[str, Any] = {}
+        chunks = []
+        
+        try:
+            async for chunk in self._stream_response_with_tools(
+                system_prompt,
+                messages_text,
+                message,
+                response
+            ):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Keep whatever was generated, even if the client disconnected early
+            if chunks or response:
+                await self._finish_turn(context, "".join(chunks), response.get("metadata"))
+    
+    async def _prepare_turn(self, user_id: str, message: str):
+        """
+        Record the user message and build the prompt inputs for a turn.
+        
+        Args:
+            user_id: User identifier
+            message: User message
+        
+        Returns:
+            Tuple of (context, system prompt, formatted history)
+        """
+        context = await self.get_or_create_context(user_id)
+        
+        # Add user message to history
+        context.add_message("user", message)
+        
+        app_logger.info("Processing message from user %s: %s...", user_id, message[:50])
+        
+        # Get system prompt with context
+        system_prompt = context.get_system_prompt()
+        
+        # Older turns are carried by the rolling summary, so only the
+        # messages it may not cover yet are sent verbatim. The summary is
+        # refreshed every SUMMARY_INTERVAL turns of two messages each, so up
+        # to that many messages can be missing from it; a fixed window of the
+        # last 2-3 messages would drop some of them from the prompt
+        history = context.get_conversation_history(limit=config.SUMMARY_INTERVAL * 2)
+        
+        # Format conversation for Ollama
+        messages_text = self._format_messages_for_llm(history)
+        if context.session_summary:
+            messages_text = f"Summary of earlier conversation: {context.session_summary}\n{messages_text}"
+        
+        return context, system_prompt, messages_text
+    
+    async def _finish_turn(
+        self,
+        context: ConversationContext,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Record the assistant response and persist the context.
+        
+        Every SUMMARY_INTERVAL turns a session summary refresh is started in
+        the background so the reply is not delayed by it.
+        
+        Args:
+            context: Conversation context
+            text: Assistant response
+            metadata: Optional metadata about the response
+        """
+        # Add assistant response to history
+        context.add_message("assistant", text, metadata)
+        context.turns_since_summary += 1
+        
+        if context.turns_since_summary >= config.SUMMARY_INTERVAL:
+            context.turns_since_summary = 0
+            task = asyncio.create_task(self._refresh_summary(context))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        
+        if self.context_store is not None:
+            await self.context_store.save(context)
+    
+    async def _refresh_summary(self, context: ConversationContext):
+        """
+        Fold the recent messages into the context's session summary.
+        
+        Args:
+            context: Conversation context
+        """
+        history = context.get_conversation_history(limit=config.SUMMARY_INTERVAL * 2)
+        
+        summary_prompt = f"""Current summary of the conversation:
+{context.session_summary or "None"}
+
+New messages:
+{self._format_messages_for_llm(history)}
+
+Update the summary with the new messages in at most five sentences. Keep the stock symbols discussed, the user's preferences and any recommendations given. Respond with the summary only.
+"""
+
+        try:
+            summary = (await self.ollama.generate(
+                summary_prompt,
+                temperature=0.2,
+                max_tokens=256
+            )).strip()
+            
+            if self.context_store is not None:
+                # Only the summary key is written, so turns saved while this
+                # task ran are kept and cannot overwrite the new summary
+                await self.context_store.save_summary(context.user_id, summary)
+            
+            context.session_summary = summary
+            app_logger.debug("Refreshed session summary for user %s", context.user_id)
+        
+        except Exception as e:
+            app_logger.warning("Error refreshing session summary: %s", e)
+    
+    @staticmethod
+    def _build_chat_messages(
         system_prompt: str,
         messages_text: str,
         user_message: str
-    ) -> Dict[str, Any]:
+    ) -> List[Dict[str, Any]]:
         """
-        Generate response with tool calling capability.
+        Build the chat messages for the first LLM call of a turn.
         
         Args:
             system_prompt: System prompt for the agent
@@ -120,74 +456,268 @@ class AgentOrchestrator:
             user_message: Current user message
         
         Returns:
-            Response with analysis
+            Chat messages
         """
-        # First, let the LLM decide what tools to use
-        tool_decision_prompt = f"""{system_prompt}
-
-Conversation History:
+        return [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": f"""Conversation History:
 {messages_text}
 
 User: {user_message}
-
-Based on the user's message, decide which tools to use (if any):
-1. analyze_stock(symbol) - for analyzing a specific stock
-2. compare_stocks(symbols) - for comparing multiple stocks
-3. get_market_news(limit) - for getting market news
-
-Respond with a JSON object containing:
-{{"tools": ["tool_name(param)"], "reasoning": "why you chose these tools"}}
-
-If no tools are needed, respond with: {{"tools": [], "reasoning": "reason"}}
 """
+            }
+        ]
+    
+    def _select_tool_calls(self, reply: Dict[str, Any]) -> List[ToolCall]:
+        """
+        Get the tool calls requested by the first reply.
+        
+        Args:
+            reply: Assistant message with 'content' and optional 'tool_calls'
+        
+        Returns:
+            Usable tool calls
+        """
+        tool_calls = reply.get("tool_calls") or []
+        if tool_calls:
+            return self._native_tool_calls(tool_calls)
+        
+        # Models without native tool support may still answer with a
+        # {"tools": [...]} decision in the message content
+        return self._parse_tool_strings(self._parse_tool_decision(reply.get("content", "")))
+    
+    async def _run_selected_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        reply: Dict[str, Any],
+        calls: List[ToolCall]
+    ) -> Dict[str, Any]:
+        """
+        Run the selected tools and hand their results back to the model.
+        
+        Appends the first reply and the tool results to ``messages`` so the
+        next chat call produces the final answer.
+        
+        Args:
+            messages: Chat messages of the turn
+            reply: First assistant message
+            calls: Tool calls to run
+        
+        Returns:
+            Response fields: analysis, tools_used and metadata
+        """
+        tools_to_use = [label for label, _, _ in calls]
+        analysis_results = await self._run_tool_calls(calls) if calls else {}
+        
+        if calls:
+            messages.append({
+                "role": "assistant",
+                "content": reply.get("content", ""),
+                "tool_calls": reply.get("tool_calls") or []
+            })
+            messages.extend(
+                {
+                    "role": "tool",
+                    "content": orjson.dumps(
+                        {name: result}, option=_TOOL_RESULT_OPTIONS
+                    ).decode()
+                }
+                for name, result in analysis_results.items()
+            )
+        
+        return {
+            "analysis": analysis_results,
+            "tools_used": tools_to_use,
+            "metadata": {
+                "tool_count": len(tools_to_use),
+                "has_analysis": bool(analysis_results)
+            }
+        }
+    
+    async def _generate_response_with_tools(
+        self,
+        system_prompt: str,
+        messages_text: str,
+        user_message: str
+    ) -> Dict[str, Any]:
+        """
+        Generate response with tool calling capability.
+        
+        A single chat call both answers and selects tools through Ollama's
+        native tool calling; a follow-up call is only made when tools ran.
+        
+        Args:
+            system_prompt: System prompt for the agent
+            messages_text: Formatted conversation history
+            user_message: Current user message
+        
+        Returns:
+            Response with analysis
+        """
+        messages = self._build_chat_messages(system_prompt, messages_text, user_message)
         
         try:
-            # Get tool decision from LLM
-            tool_response = await self.ollama.generate(
-                tool_decision_prompt,
-                temperature=0.3
+            reply = await self.ollama.chat(
+                messages,
+                tools=_TOOL_DEFINITIONS,
+                temperature=0.7
             )
             
-            # Parse tool decision
-            tools_to_use = self._parse_tool_decision(tool_response)
+            calls = self._select_tool_calls(reply)
+            response = await self._run_selected_tools(messages, reply, calls)
             
-            # Execute tools
-            analysis_results = {}
-            if tools_to_use:
-                analysis_results = await self._execute_tools(tools_to_use)
-            
-            # Generate final response
-            final_prompt = f"""{system_prompt}
-
-Conversation History:
-{messages_text}
-
-User: {user_message}
-
-{f'Analysis Results: {json.dumps(analysis_results, indent=2)}' if analysis_results else ''}
-
-Generate a helpful response to the user based on the above information. Be conversational and provide actionable insights.
-"""
+            if not calls:
+                # The first reply already is the answer
+                response["text"] = reply.get("content", "")
+                return response
             
-            final_response = await self.ollama.generate(
-                final_prompt,
+            final_reply = await self.ollama.chat(
+                messages,
                 temperature=0.7
             )
+            response["text"] = final_reply.get("content", "")
             
-            return {
-                "text": final_response,
-                "analysis": analysis_results,
-                "tools_used": tools_to_use,
-                "metadata": {
-                    "tool_count": len(tools_to_use),
-                    "has_analysis": bool(analysis_results)
-                }
-            }
+            return response
         
         except Exception as e:
-            app_logger.error(f"Error generating response: {str(e)}")
+            app_logger.error("Error generating response: %s", e)
             raise
     
+    async def _stream_response_with_tools(
+        self,
+        system_prompt: str,
+        messages_text: str,
+        user_message: str,
+        response: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response with tool calling capability.
+        
+        The first chat call is streamed with the tools offered: its text is
+        passed through as it arrives while tool calls are collected from the
+        frames. When tools were called, they run and the final answer is
+        streamed as well.
+        
+        Args:
+            system_prompt: System prompt for the agent
+            messages_text: Formatted conversation history
+            user_message: Current user message
+            response: Filled in place with analysis, tools_used and metadata
+        
+        Yields:
+            Response text chunks as they are generated
+        """
+        messages = self._build_chat_messages(system_prompt, messages_text, user_message)
+        
+        try:
+            content = []
+            tool_calls = []
+            # A reply opening with "{" may be a {"tools": [...]} decision from a
+            # model without native tool support; hold it back until it is complete
+            held_back = None
+            
+            async for frame in self.ollama.chat_streaming_messages(
+                messages,
+                tools=_TOOL_DEFINITIONS,
+                temperature=0.7
+            ):
+                tool_calls.extend(frame.get("tool_calls") or [])
+                delta = frame.get("content", "")
+                if not delta:
+                    continue
+                
+                content.append(delta)
+                if held_back is None:
+                    if not "".join(content).strip():
+                        continue
+                    held_back = "".join(content).lstrip().startswith("{")
+                    delta = "".join(content)
+                if not held_back:
+                    yield delta
+            
+            reply = {"content": "".join(content), "tool_calls": tool_calls}
+            calls = self._select_tool_calls(reply)
+            response.update(await self._run_selected_tools(messages, reply, calls))
+            
+            if not calls:
+                # The first reply already is the answer
+                if held_back:
+                    yield reply["content"]
+                return
+            
+            async for chunk in self.ollama.chat_streaming(
+                messages,
+                temperature=0.7
+            ):
+                yield chunk
+        
+        except Exception as e:
+            app_logger.error("Error generating response: %s", e)
+            raise
+    
+    @staticmethod
+    def _native_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[ToolCall]:
+        """
+        Validate native tool calls from the LLM.
+        
+        Args:
+            tool_calls: Tool calls from the LLM response
+        
+        Returns:
+            Usable calls as (label, tool name, arguments); the label renders the
+            call in the agent's syntax, e.g. 'analyze_stock("AAPL")'
+        """
+        calls = []
+        
+        for call in tool_calls:
+            function = call.get("function") or {}
+            name = function.get("name", "")
+            arguments = function.get("arguments") or {}
+            
+            # Some models send the arguments as a JSON string
+            if isinstance(arguments, str):
+                try:
+                    arguments = orjson.loads(arguments) if arguments.strip() else {}
+                except orjson.JSONDecodeError:
+                    arguments = None
+            
+            if name not in _TOOL_BUILDERS or not isinstance(arguments, dict):
+                app_logger.warning("Ignoring unusable tool call: %s", call)
+                continue
+            
+            rendered = ", ".join(orjson.dumps(value).decode() for value in arguments.values())
+            calls.append((f"{name}({rendered})", name, arguments))
+        
+        return calls
+    
+    @staticmethod
+    def _parse_tool_strings(tools: List[str]) -> List[ToolCall]:
+        """
+        Parse tool strings in the agent's call syntax.
+        
+        Args:
+            tools: Tool strings such as 'analyze_stock("AAPL")'
+        
+        Returns:
+            Parsed calls as (tool string, tool name, arguments)
+        """
+        calls = []
+        
+        for tool in tools:
+            name = tool.split("(", 1)[0].strip()
+            parser = _TOOL_PARSERS.get(name)
+            arguments = parser(tool) if parser else None
+            
+            if arguments is None:
+                app_logger.warning("Ignoring unparseable tool call: %s", tool)
+                continue
+            
+            calls.append((tool, name, arguments))
+        
+        return calls
+    
     def _parse_tool_decision(self, response: str) -> list:
         """
         Parse tool decision from LLM response.
@@ -198,14 +728,23 @@ Generate a helpful response to the user based on the above information. Be conve
         Returns:
             List of tools to execute
         """
+        text = response.strip()
+        
         try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\\{.*\\}', response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
+            try:
+                # JSON mode normally returns a bare object
+                data = orjson.loads(text)
+            except orjson.JSONDecodeError:
+                # Fall back to the outermost braces when the model adds prose
+                start, end = text.find("{"), text.rfind("}")
+                if start == -1 or end <= start:
+                    return []
+                data = orjson.loads(text[start:end + 1])
+            
+            if isinstance(data, dict):
                 return data.get("tools", [])
         except Exception as e:
-            app_logger.warning(f"Error parsing tool decision: {str(e)}")
+            app_logger.warning("Error parsing tool decision: %s", e)
         
         return []
     
@@ -219,34 +758,42 @@ Generate a helpful response to the user based on the above information. Be conve
         Returns:
             Results from tool execution
         """
+        return await self._run_tool_calls(self._parse_tool_strings(tools))
+    
+    async def _run_tool_calls(self, calls: List[ToolCall]) -> Dict[str, Any]:
+        """
+        Run validated tool calls concurrently.
+        
+        Args:
+            calls: Calls as (label, tool name, arguments)
+        
+        Returns:
+            Results from tool execution
+        """
+        # Build every MCP call first so they can run concurrently
+        pending = []
+        
+        for label, name, arguments in calls:
+            call = _TOOL_BUILDERS[name](self.mcp, arguments)
+            if call is None:
+                app_logger.warning("Ignoring tool call with invalid arguments: %s", label)
+                continue
+            key, coro = call
+            pending.append((key, label, coro))
+        
+        outcomes = await asyncio.gather(
+            *(coro for _, _, coro in pending),
+            return_exceptions=True
+        )
+        
         results = {}
         
-        for tool in tools:
-            try:
-                if "analyze_stock" in tool:
-                    # Extract symbol from tool call
-                    symbol_match = re.search(r'analyze_stock\\((.*?)\\)', tool)
-                    if symbol_match:
-                        symbol = symbol_match.group(1).strip().strip('"').strip("'").strip('\\')
-                        result = await self.mcp.analyze_stock(symbol)
-                        results[f"analyze_stock_{symbol}"] = result
-                
-                elif "compare_stocks" in tool:
-                    # Extract symbols from tool call
-                    symbols_match = re.search(r'compare_stocks\\(\\[(.*?)\\]\\)', tool)
-                    if symbols_match:
-                        symbols_str = symbols_match.group(1)
-                        symbols = [s.strip().strip('"').strip("'").strip('\\') for s in symbols_str.split(",")]
-                        result = await self.mcp.compare_stocks(symbols)
-                        results["compare_stocks"] = result
-                
-                elif "get_market_news" in tool:
-                    result = await self.mcp.get_market_news()
-                    results["market_news"] = result
-            
-            except Exception as e:
-                app_logger.error(f"Error executing tool {tool}: {str(e)}")
-                results[tool] = {"error": str(e)}
+        for (key, tool, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                app_logger.error("Error executing tool %s: %s", tool, outcome)
+                results[tool] = {"error": str(outcome)}
+            else:
+                results[key] = outcome
         
         return results
     
@@ -260,22 +807,18 @@ Generate a helpful response to the user based on the above information. Be conve
         Returns:
             Formatted message string
         """
-        formatted = []
-        
-        for msg in messages:
-            role = msg["role"].capitalize()
-            content = msg["content"]
-            formatted.append(f"{role}: {content}")
-        
-        return "\\n".join(formatted)
+        return "\n".join(f"{msg.role.capitalize()}: {msg.content}" for msg in messages)
     
-    def clear_context(self, user_id: str):
+    async def clear_context(self, user_id: str):
         """
         Clear conversation context for user.
         
         Args:
             user_id: User identifier
         """
+        if self.context_store is not None:
+            await self.context_store.delete(user_id)
+        
         if user_id in self.contexts:
             del self.contexts[user_id]
-            app_logger.info(f"Cleared context for user {user_id}")
+            app_logger.info("Cleared context for user %s", user_id)
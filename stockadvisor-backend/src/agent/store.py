@@ -0,0 +1,102 @@
+"""
+Persistent storage for conversation contexts.
+
+Keeps serialized contexts in Redis so any backend replica can serve a user.
+"""
+
+from typing import Optional
+import orjson
+import redis.asyncio as redis
+from src.utils.logger import app_logger
+from src.utils.config import config
+from src.agent.context import ConversationContext
+
+
+class RedisContextStore:
+    """
+    Redis-backed store for conversation contexts.
+    
+    Each context is stored as its to_dict() JSON blob under ``ctx:{user_id}``.
+    The session summary lives under its own ``summary:{user_id}`` key, so the
+    background summary refresh and a concurrent turn never overwrite each other.
+    """
+    
+    def __init__(self, url: str = None, ttl: int = None):
+        """
+        Initialize the context store.
+        
+        Args:
+            url: Redis connection URL (default from config)
+            ttl: Seconds a stored context survives without activity (default from config)
+        """
+        self.redis = redis.from_url(url or config.REDIS_URL)
+        self.ttl = ttl or config.CONTEXT_IDLE_TIMEOUT
+        app_logger.info("Redis context store initialized")
+    
+    @staticmethod
+    def _key(user_id: str) -> str:
+        """Build the Redis key for a user's context."""
+        return f"ctx:{user_id}"
+    
+    @staticmethod
+    def _summary_key(user_id: str) -> str:
+        """Build the Redis key for a user's session summary."""
+        return f"summary:{user_id}"
+    
+    async def load(self, user_id: str) -> Optional[ConversationContext]:
+        """
+        Load a user's context.
+        
+        Args:
+            user_id: User identifier
+        
+        Returns:
+            Stored context, or None if the user has no stored context
+        """
+        blob, summary = await self.redis.mget(self._key(user_id), self._summary_key(user_id))
+        if blob is None:
+            return None
+        
+        context = ConversationContext.from_dict(orjson.loads(blob))
+        if summary is not None:
+            context.session_summary = summary.decode()
+        return context
+    
+    async def save(self, context: ConversationContext):
+        """
+        Save a user's context, leaving its session summary untouched.
+        
+        Args:
+            context: Context to store
+        """
+        data = context.to_dict()
+        # Written only by save_summary; a turn's copy may predate the latest one
+        del data["session_summary"]
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(context.user_id), orjson.dumps(data), ex=self.ttl)
+            pipe.expire(self._summary_key(context.user_id), self.ttl)
+            await pipe.execute()
+    
+    async def save_summary(self, user_id: str, summary: str):
+        """
+        Save a user's session summary.
+        
+        Args:
+            user_id: User identifier
+            summary: Session summary
+        """
+        await self.redis.set(self._summary_key(user_id), summary, ex=self.ttl)
+    
+    async def delete(self, user_id: str):
+        """
+        Delete a user's context.
+        
+        Args:
+            user_id: User identifier
+        """
+        await self.redis.delete(self._key(user_id), self._summary_key(user_id))
+    
+    async def close(self):
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
@@ -4,9 +4,12 @@ FastAPI routes for StockAdvisor+ Bot backend.
 Defines all API endpoints for the application.
 """
 
-from datetime import datetime
+import time
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from src.utils.logger import app_logger
+from src.utils.clock import cached_iso_now
 from src.api.schemas import (
     MessageRequest,
     MessageResponse,
@@ -24,6 +27,11 @@ agent_orchestrator = None
 mcp_server = None
 ollama_client = None
 
+# (expires_at, available) of the last Ollama probe, so frequent liveness
+# probes don't hit Ollama on every request
+_OLLAMA_HEALTH_TTL = 5.0
+_ollama_health = (0.0, False)
+
 
 def setup_routes(orchestrator, mcp, ollama):
     """
@@ -40,6 +48,25 @@ def setup_routes(orchestrator, mcp, ollama):
     ollama_client = ollama
 
 
+async def _check_ollama() -> bool:
+    """
+    Check Ollama availability, reusing a recent result.
+    
+    Returns:
+        True if Ollama is available, False otherwise
+    """
+    global _ollama_health
+    
+    expires_at, available = _ollama_health
+    now = time.monotonic()
+    
+    if now >= expires_at:
+        available = await ollama_client.health_check()
+        _ollama_health = (now + _OLLAMA_HEALTH_TTL, available)
+    
+    return available
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -49,14 +76,14 @@ async def health_check():
         Health status of the service
     """
     try:
-        ollama_available = ollama_client.health_check() if ollama_client else False
+        ollama_available = await _check_ollama() if ollama_client else False
         mcp_available = mcp_server is not None
         
         return HealthResponse(
             status="healthy" if (ollama_available and mcp_available) else "degraded",
             ollama_available=ollama_available,
             mcp_available=mcp_available,
-            timestamp=datetime.now().isoformat()
+            timestamp=cached_iso_now()
         )
     except Exception as e:
         app_logger.error(f"Health check failed: {str(e)}")
@@ -86,13 +113,15 @@ async def chat(request: MessageRequest):
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("error"))
         
-        return MessageResponse(
+        # Analyses carry numpy price columns; encode them with orjson directly
+        # instead of FastAPI's JSON-mode serialization, which rejects ndarrays
+        return ORJSONResponse(MessageResponse(
             success=True,
             user_id=request.user_id,
             response=result["response"],
             analysis=result.get("analysis"),
             tools_used=result.get("tools_used", [])
-        )
+        ).model_dump())
     
     except HTTPException:
         raise
@@ -101,6 +130,37 @@ async def chat(request: MessageRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/chat/stream")
+async def chat_stream(request: MessageRequest):
+    """
+    Process chat message and stream the response.
+    
+    Args:
+        request: Message request
+    
+    Returns:
+        Server-sent events carrying JSON-encoded response text chunks
+    """
+    if not agent_orchestrator:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+    
+    async def event_stream():
+        try:
+            async for chunk in agent_orchestrator.process_message_stream(
+                request.user_id,
+                request.message
+            ):
+                yield f"data: {orjson.dumps(chunk).decode()}\n\n"
+            
+            yield "event: done\ndata: {}\n\n"
+        
+        except Exception as e:
+            app_logger.error(f"Error streaming chat: {str(e)}")
+            yield f"event: error\ndata: {orjson.dumps(str(e)).decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_stock(request: AnalysisRequest):
     """
@@ -241,7 +301,7 @@ async def clear_context(user_id: str):
         if not agent_orchestrator:
             raise HTTPException(status_code=503, detail="Agent not initialized")
         
-        agent_orchestrator.clear_context(user_id)
+        await agent_orchestrator.clear_context(user_id)
         
         return {"success": True, "message": f"Context cleared for user {user_id}"}
     
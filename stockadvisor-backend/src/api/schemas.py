@@ -5,11 +5,13 @@ Defines request and response models for the FastAPI endpoints.
 """
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MessageRequest(BaseModel):
     """Request model for chat messages."""
+    model_config = ConfigDict(extra="forbid")
+    
     user_id: str = Field(..., description="Unique user identifier")
     message: str = Field(..., description="User message")
 
@@ -25,6 +27,8 @@ class MessageResponse(BaseModel):
 
 class AnalysisRequest(BaseModel):
     """Request model for stock analysis."""
+    model_config = ConfigDict(extra="forbid")
+    
     symbol: str = Field(..., description="Stock ticker symbol")
 
 
@@ -50,6 +54,8 @@ class AnalysisResponse(BaseModel):
 
 class ComparisonRequest(BaseModel):
     """Request model for stock comparison."""
+    model_config = ConfigDict(extra="forbid")
+    
     symbols: List[str] = Field(..., description="List of stock ticker symbols")
 
 
@@ -5,89 +5,110 @@ Initializes FastAPI application with all components.
 """
 
 import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.utils.logger import app_logger
 from src.utils.config import config
 from src.ollama.client import OllamaClient
 from src.mcp.server import MCPServer
 from src.agent.orchestrator import AgentOrchestrator
+from src.agent.store import RedisContextStore
 from src.api import router, setup_routes
 
 
-def create_app() -> FastAPI:
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """
-    Create and configure FastAPI application.
+    Create the long-lived components on startup and close them on shutdown.
     
-    Returns:
-        Configured FastAPI application
+    The HTTP pools, caches and semaphores are built inside the running event
+    loop and shared by every request for the life of the process.
+    
+    Args:
+        app: FastAPI application
     """
-    app = FastAPI(
-        title="StockAdvisor+ Bot API",
-        description="Conversational AI agent for stock market analysis",
-        version="1.0.0"
-    )
+    app_logger.info("Initializing StockAdvisor+ Bot backend...")
     
-    # Add CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[config.FRONTEND_URL],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    # Initialize Ollama client
+    ollama_client = OllamaClient()
     
-    # Initialize components
-    app_logger.info("Initializing StockAdvisor+ Bot backend...")
+    # Initialize the shared context store when Redis is configured
+    context_store = RedisContextStore() if config.REDIS_URL else None
     
-    try:
-        # Initialize Ollama client
-        ollama_client = OllamaClient()
-        
-        # Check Ollama availability
-        if not ollama_client.health_check():
-            app_logger.warning("Ollama service is not available. Some features may not work.")
-        else:
-            app_logger.info("Ollama service is available")
-        
-        # Initialize MCP server
-        mcp_server = MCPServer()
+    # Initialize MCP server; leaving the block closes its scrapers
+    async with MCPServer() as mcp_server:
         app_logger.info("MCP server initialized")
         
         # Initialize agent orchestrator
-        agent_orchestrator = AgentOrchestrator(ollama_client, mcp_server)
+        agent_orchestrator = AgentOrchestrator(ollama_client, mcp_server, context_store)
         app_logger.info("Agent orchestrator initialized")
         
         # Setup routes with dependencies
         setup_routes(agent_orchestrator, mcp_server, ollama_client)
         
-        # Include routes
-        app.include_router(router, prefix="/api")
-        
-        # Store components in app state for cleanup
+        # Store components in app state
         app.state.ollama_client = ollama_client
         app.state.mcp_server = mcp_server
         app.state.agent_orchestrator = agent_orchestrator
+        app.state.context_store = context_store
         
-        app_logger.info("Backend initialized successfully")
-    
-    except Exception as e:
-        app_logger.error(f"Error initializing backend: {str(e)}")
-        raise
-    
-    # Shutdown event
-    @app.on_event("shutdown")
-    async def shutdown_event():
-        """Cleanup on shutdown."""
-        app_logger.info("Shutting down backend...")
+        if not await ollama_client.health_check():
+            app_logger.warning("Ollama service is not available. Some features may not work.")
+        else:
+            app_logger.info("Ollama service is available")
         
-        if hasattr(app.state, "ollama_client"):
-            app.state.ollama_client.close()
+        context_eviction_task = asyncio.create_task(
+            agent_orchestrator.run_context_eviction()
+        )
         
-        if hasattr(app.state, "mcp_server"):
-            app.state.mcp_server.close()
+        app_logger.info("Backend initialized successfully")
         
-        app_logger.info("Backend shutdown complete")
+        try:
+            yield
+        finally:
+            app_logger.info("Shutting down backend...")
+            
+            # Let the eviction loop unwind before the clients it uses are closed
+            context_eviction_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await context_eviction_task
+            
+            await ollama_client.close()
+            
+            if context_store is not None:
+                await context_store.close()
+    
+    app_logger.info("Backend shutdown complete")
+
+
+def create_app() -> FastAPI:
+    """
+    Create and configure FastAPI application.
+    
+    Returns:
+        Configured FastAPI application
+    """
+    app = FastAPI(
+        title="StockAdvisor+ Bot API",
+        description="Conversational AI agent for stock market analysis",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+    
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[config.FRONTEND_URL],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Include routes
+    app.include_router(router, prefix="/api")
     
     return app
 
@@ -107,12 +128,21 @@ async def root():
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
+    # uvicorn[standard] ships uvloop everywhere except Windows
+    loop = "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+    
     uvicorn.run(
         "src.main:app",
         host=config.BACKEND_HOST,
         port=config.BACKEND_PORT,
         reload=config.DEBUG,
+        # Worker processes and the native loop/parser are production settings;
+        # reload mode runs a single worker
+        workers=1 if config.DEBUG else config.WORKERS,
+        loop=loop,
+        http="httptools",
         log_level="info"
     )
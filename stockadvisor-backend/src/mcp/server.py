@@ -4,8 +4,13 @@ MCP Server for StockAdvisor+ Bot.
 Orchestrates all tools and exposes them through a unified interface.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+import asyncio
+import numpy as np
 from src.utils.logger import app_logger
+from src.utils.config import config
+from src.utils.cache import TTLCache
 from src.mcp.tools import (
     StockScraper,
     NewsScraper,
@@ -30,18 +35,32 @@ class MCPServer:
         self.sentiment_analyzer = SentimentAnalyzer()
         self.report_generator = ReportGenerator()
         
+        # Recent analyses by symbol; market data is usable for minutes
+        self._analysis_cache = TTLCache(config.ANALYSIS_CACHE_SIZE, config.ANALYSIS_CACHE_TTL)
+        
+        # Caps parallel analyses in a comparison to spare the stock/news backends
+        self._analysis_semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_ANALYSES)
+        
         app_logger.info("MCP Server initialized")
     
-    async def analyze_stock(self, symbol: str) -> Dict[str, Any]:
+    async def analyze_stock(self, symbol: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform complete stock analysis.
         
         Args:
             symbol: Stock ticker symbol
+            timestamp: ISO timestamp for the report (default: now, UTC)
         
         Returns:
             Complete analysis report
         """
+        # Normalize once so the fetches, the report and the cache agree on spelling
+        symbol = symbol.upper()
+        cached = self._analysis_cache.get(symbol)
+        if cached is not None:
+            app_logger.debug(f"Analysis cache hit for {symbol}")
+            return cached
+        
         try:
             app_logger.info(f"Starting analysis for {symbol}")
             
@@ -50,15 +69,26 @@ class MCPServer:
             
             # Get historical data for technical analysis
             historical_data = await self.stock_scraper.get_historical_data(symbol, "1y")
-            prices = [dp["close"] for dp in historical_data["data_points"] if dp["close"]]
+            closes = historical_data["close"]
+            prices = closes[~np.isnan(closes)]
             
             # Perform technical analysis
-            technical_analysis = {
-                "trend": self.technical_analyzer.analyze_trend(prices),
-                "rsi": self.technical_analyzer.calculate_rsi(prices),
-                "macd": self.technical_analyzer.calculate_macd(prices),
-                "moving_average_20": self.technical_analyzer.calculate_moving_average(prices, 20)
-            }
+            if prices.size < 15:
+                # Too short for RSI (15), MA-20 and MACD (26): all would be empty
+                technical_analysis = {
+                    "trend": self.technical_analyzer.analyze_trend(prices),
+                    "rsi": 0.0,
+                    "macd": {"macd": 0.0, "signal": 0.0, "histogram": 0.0},
+                    "moving_average_20": []
+                }
+            else:
+                technical_analysis = {
+                    "trend": self.technical_analyzer.analyze_trend(prices),
+                    # Latest Wilder-smoothed value; calculate_rsi only sees the oldest deltas
+                    "rsi": float(self.technical_analyzer.calculate_rsi_series(prices)[-1]),
+                    "macd": self.technical_analyzer.calculate_macd(prices),
+                    "moving_average_20": self.technical_analyzer.calculate_moving_average(prices, 20)
+                }
             
             # Get news
             news_data = await self.news_scraper.get_news_for_symbol(symbol, limit=10)
@@ -73,18 +103,23 @@ class MCPServer:
                 symbol,
                 stock_data,
                 technical_analysis,
-                news_sentiment
+                news_sentiment,
+                timestamp=timestamp
             )
             
             app_logger.info(f"Analysis completed for {symbol}")
             
-            return {
+            result = {
                 "success": True,
                 "symbol": symbol,
                 "report": report,
                 "news": news_data["articles"][:5],  # Top 5 articles
                 "historical_data": historical_data
             }
+            
+            self._analysis_cache.set(symbol, result)
+            
+            return result
         
         except Exception as e:
             app_logger.error(f"Error analyzing {symbol}: {str(e)}")
@@ -94,6 +129,20 @@ class MCPServer:
                 "error": str(e)
             }
     
+    async def _bounded_analyze_stock(self, symbol: str, timestamp: str) -> Dict[str, Any]:
+        """
+        Analyze a stock while holding a slot of the analysis semaphore.
+        
+        Args:
+            symbol: Stock ticker symbol
+            timestamp: ISO timestamp for the report
+        
+        Returns:
+            Complete analysis report
+        """
+        async with self._analysis_semaphore:
+            return await self.analyze_stock(symbol, timestamp=timestamp)
+    
     async def compare_stocks(self, symbols: List[str]) -> Dict[str, Any]:
         """
         Compare multiple stocks.
@@ -107,20 +156,27 @@ class MCPServer:
         try:
             app_logger.info(f"Starting comparison for {symbols}")
             
+            # One timestamp for the whole comparison and its fresh reports
+            timestamp = datetime.now(timezone.utc).isoformat()
+            
+            results = await asyncio.gather(
+                *(self._bounded_analyze_stock(symbol, timestamp) for symbol in symbols),
+                return_exceptions=True
+            )
+            
             analyses = {}
             
-            for symbol in symbols:
-                try:
-                    result = await self.analyze_stock(symbol)
-                    if result["success"]:
-                        analyses[symbol] = result["report"]
-                except Exception as e:
-                    app_logger.warning(f"Error analyzing {symbol}: {str(e)}")
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, Exception):
+                    app_logger.warning(f"Error analyzing {symbol}: {str(result)}")
+                elif result["success"]:
+                    analyses[symbol] = result["report"]
             
             # Generate comparison
             comparison = self.report_generator.generate_comparison_report(
                 symbols,
-                analyses
+                analyses,
+                timestamp=timestamp
             )
             
             app_logger.info(f"Comparison completed for {symbols}")
@@ -169,6 +225,28 @@ class MCPServer:
                 "error": str(e)
             }
     
+    def clear_cache(self):
+        """Drop every cached analysis and reset the hit/miss counters."""
+        self._analysis_cache.clear()
+        app_logger.info("Analysis cache cleared")
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get analysis cache statistics.
+        
+        Returns:
+            Dictionary with cache size, hits, misses and hit rate
+        """
+        cache = self._analysis_cache
+        lookups = cache.hits + cache.misses
+        
+        return {
+            "size": len(cache),
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": cache.hits / lookups if lookups else 0.0
+        }
+    
     def get_available_tools(self) -> List[Dict[str, Any]]:
         """
         Get list of available tools.
@@ -200,12 +278,16 @@ class MCPServer:
             }
         ]
     
-    def close(self):
+    async def aclose(self):
         """Close all resources."""
-        self.stock_scraper.close()
-        self.news_scraper.close()
+        await self.news_scraper.aclose()
+        await self.stock_scraper.aclose()
         app_logger.info("MCP Server closed")
     
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        self.close()
+    async def __aenter__(self) -> "MCPServer":
+        """Use the server as ``async with MCPServer() as mcp:``."""
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        """Close all resources when leaving the ``async with`` block."""
+        await self.aclose()
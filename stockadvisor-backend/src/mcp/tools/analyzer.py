@@ -4,11 +4,140 @@ Analysis tools for MCP.
 Provides technical analysis, sentiment analysis, and data processing capabilities.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+import logging
+import re
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numba import njit
 from src.utils.logger import app_logger
 
+# Up to this period, windowed means are cheap and avoid cumulative-sum rounding drift
+_SMALL_WINDOW = 32
+
+# Indicators take plain lists or the float64 columns returned by StockScraper
+Prices = Union[List[float], np.ndarray]
+
+
+@njit(cache=True, fastmath=True)
+def _ema_kernel(prices: np.ndarray, period: int) -> float:
+    """
+    Run the EMA recurrence over a float64 price array.
+    
+    Args:
+        prices: Array of prices (at least ``period`` long)
+        period: Period for EMA
+    
+    Returns:
+        Final EMA value
+    """
+    multiplier = 2.0 / (period + 1)
+    ema = prices[:period].mean()
+    
+    for i in range(period, prices.shape[0]):
+        ema = (prices[i] - ema) * multiplier + ema
+    
+    return ema
+
+
+@njit(cache=True, fastmath=True)
+def _ema_series_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Run the EMA recurrence over a float64 price array, keeping every value.
+    
+    Args:
+        prices: Array of prices (at least ``period`` long)
+        period: Period for EMA
+    
+    Returns:
+        Array of ``len(prices) - period + 1`` EMA values, the first one being
+        the SMA seed over the first ``period`` prices
+    """
+    n = prices.shape[0]
+    multiplier = 2.0 / (period + 1)
+    out = np.empty(n - period + 1, dtype=np.float64)
+    ema = prices[:period].mean()
+    out[0] = ema
+    
+    for i in range(period, n):
+        ema = (prices[i] - ema) * multiplier + ema
+        out[i - period + 1] = ema
+    
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _rsi_series_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Compute RSI with Wilder smoothing for every price after the seed window.
+    
+    Args:
+        prices: Array of prices (at least ``period + 1`` long)
+        period: Period for RSI calculation
+    
+    Returns:
+        Array of ``len(prices) - period`` RSI values (0-100)
+    """
+    n = prices.shape[0]
+    out = np.empty(n - period, dtype=np.float64)
+    up = 0.0
+    down = 0.0
+    
+    for i in range(1, period + 1):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            up += delta
+        else:
+            down -= delta
+    up /= period
+    down /= period
+    
+    for i in range(period, n):
+        if i > period:
+            delta = prices[i] - prices[i - 1]
+            up = (up * (period - 1) + max(delta, 0.0)) / period
+            down = (down * (period - 1) + max(-delta, 0.0)) / period
+        
+        if down == 0:
+            out[i - period] = 50.0 if up == 0 else 100.0
+        else:
+            out[i - period] = 100.0 - 100.0 / (1.0 + up / down)
+    
+    return out
+
+
+def _keyword_polarity(
+    positive: Iterable[str],
+    negative: Iterable[str],
+    inflections: Iterable[str]
+) -> Dict[str, int]:
+    """
+    Map every keyword and its inflected forms to a polarity index.
+    
+    Args:
+        positive: Positive keywords
+        negative: Negative keywords
+        inflections: Suffixes accepted after a keyword ("" for the bare word)
+    
+    Returns:
+        Dictionary of word form to 1 (positive) or 0 (negative)
+    """
+    inflections = tuple(inflections)
+    polarity = {}
+    for index, keywords in ((1, positive), (0, negative)):
+        for keyword in keywords:
+            for suffix in inflections:
+                polarity.setdefault(keyword + suffix, index)
+    return polarity
+
+
+# Compile once at import so the first analysis does not pay the JIT cost
+_ema_kernel(np.zeros(2, dtype=np.float64), 1)
+_ema_series_kernel(np.zeros(2, dtype=np.float64), 1)
+_rsi_series_kernel(np.zeros(2, dtype=np.float64), 1)
+
 
 class TechnicalAnalyzer:
     """
@@ -18,12 +147,12 @@ class TechnicalAnalyzer:
     """
     
     @staticmethod
-    def calculate_moving_average(prices: List[float], period: int = 20) -> List[float]:
+    def calculate_moving_average(prices: Prices, period: int = 20) -> List[float]:
         """
         Calculate simple moving average.
         
         Args:
-            prices: List of prices
+            prices: List or array of prices
             period: Period for moving average
         
         Returns:
@@ -32,19 +161,40 @@ class TechnicalAnalyzer:
         if len(prices) < period:
             return []
         
-        ma = []
-        for i in range(len(prices) - period + 1):
-            ma.append(np.mean(prices[i:i + period]))
+        return TechnicalAnalyzer.calculate_moving_average_array(prices, period).tolist()
+    
+    @staticmethod
+    def calculate_moving_average_array(prices: Prices, period: int = 20) -> np.ndarray:
+        """
+        Calculate simple moving average for every full window as an array.
+        
+        Small periods average a zero-copy sliding-window view directly; larger
+        ones use one cumulative-sum pass, so the cost stays O(n).
+        
+        Args:
+            prices: List or array of prices
+            period: Period for moving average
+        
+        Returns:
+            Array of moving average values (empty if fewer prices than period)
+        """
+        p = np.ascontiguousarray(prices, dtype=np.float64)
+        if p.size < period:
+            return np.empty(0, dtype=np.float64)
+        
+        if period <= _SMALL_WINDOW:
+            return sliding_window_view(p, period).mean(axis=1)
         
-        return ma
+        c = np.cumsum(p)
+        return (c[period - 1:] - np.concatenate(([0.0], c[:-period]))) / period
     
     @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> float:
+    def calculate_rsi(prices: Prices, period: int = 14) -> float:
         """
         Calculate Relative Strength Index (RSI).
         
         Args:
-            prices: List of prices
+            prices: List or array of prices
             period: Period for RSI calculation
         
         Returns:
@@ -53,10 +203,10 @@ class TechnicalAnalyzer:
         if len(prices) < period + 1:
             return 0.0
         
-        deltas = np.diff(prices)
-        seed = deltas[:period + 1]
-        up = seed[seed >= 0].sum() / period
-        down = -seed[seed < 0].sum() / period
+        # Only the first ``period`` deltas feed the seed, so slice before diffing
+        deltas = np.diff(np.asarray(prices[:period + 1], dtype=np.float64))
+        up = np.maximum(deltas, 0.0).sum() / period
+        down = np.maximum(-deltas, 0.0).sum() / period
         
         # Handle edge cases: no down moves means strong uptrend -> RSI ~100
         if down == 0:
@@ -73,12 +223,32 @@ class TechnicalAnalyzer:
         return float(rsi)
     
     @staticmethod
-    def calculate_macd(prices: List[float]) -> Dict[str, float]:
+    def calculate_rsi_series(prices: Prices, period: int = 14) -> np.ndarray:
+        """
+        Calculate RSI for every price using Wilder smoothing.
+        
+        The first value uses the same simple-average seed as calculate_rsi;
+        each later value updates the averages in O(1).
+        
+        Args:
+            prices: List or array of prices
+            period: Period for RSI calculation
+        
+        Returns:
+            Array of RSI values (0-100), one per price after the first ``period``
+        """
+        if len(prices) < period + 1:
+            return np.empty(0, dtype=np.float64)
+        
+        return _rsi_series_kernel(np.asarray(prices, dtype=np.float64), period)
+    
+    @staticmethod
+    def calculate_macd(prices: Prices) -> Dict[str, float]:
         """
         Calculate MACD (Moving Average Convergence Divergence).
         
         Args:
-            prices: List of prices
+            prices: List or array of prices
         
         Returns:
             Dictionary with MACD, signal line, and histogram
@@ -86,26 +256,32 @@ class TechnicalAnalyzer:
         if len(prices) < 26:
             return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
         
-        ema_12 = TechnicalAnalyzer._calculate_ema(prices, 12)
-        ema_26 = TechnicalAnalyzer._calculate_ema(prices, 26)
+        p = np.asarray(prices, dtype=np.float64)
+        ema_26 = _ema_series_kernel(p, 26)
+        # Align the 12-period series with the 26-period one (both end on the last price)
+        ema_12 = _ema_series_kernel(p, 12)[-ema_26.shape[0]:]
         
-        macd = ema_12 - ema_26
-        signal = TechnicalAnalyzer._calculate_ema([macd], 9)
-        histogram = macd - signal
+        macd_line = ema_12 - ema_26
+        if macd_line.shape[0] >= 9:
+            signal = _ema_series_kernel(macd_line, 9)[-1]
+        else:
+            signal = macd_line.mean()
+        
+        macd = macd_line[-1]
         
         return {
             "macd": float(macd),
             "signal": float(signal),
-            "histogram": float(histogram)
+            "histogram": float(macd - signal)
         }
     
     @staticmethod
-    def _calculate_ema(prices: List[float], period: int) -> float:
+    def _calculate_ema(prices: Prices, period: int) -> float:
         """
         Calculate Exponential Moving Average.
         
         Args:
-            prices: List of prices
+            prices: List or array of prices
             period: Period for EMA
         
         Returns:
@@ -114,21 +290,15 @@ class TechnicalAnalyzer:
         if len(prices) < period:
             return np.mean(prices)
         
-        multiplier = 2 / (period + 1)
-        ema = np.mean(prices[:period])
-        
-        for price in prices[period:]:
-            ema = (price - ema) * multiplier + ema
-        
-        return ema
+        return _ema_kernel(np.asarray(prices, dtype=np.float64), period)
     
     @staticmethod
-    def analyze_trend(prices: List[float]) -> Dict[str, Any]:
+    def analyze_trend(prices: Prices) -> Dict[str, Any]:
         """
         Analyze price trend.
         
         Args:
-            prices: List of prices
+            prices: List or array of prices
         
         Returns:
             Dictionary with trend analysis
@@ -136,8 +306,14 @@ class TechnicalAnalyzer:
         if len(prices) < 2:
             return {"trend": "unknown", "strength": 0.0}
         
-        # Calculate percentage change
-        pct_change = ((prices[-1] - prices[0]) / prices[0]) * 100 if prices[0] != 0 else 0
+        p = np.asarray(prices, dtype=np.float64)
+        
+        # Least-squares slope over the whole series, robust to noisy endpoints
+        x_centered = np.arange(p.size, dtype=np.float64) - (p.size - 1) / 2
+        slope = x_centered.dot(p - p.mean()) / x_centered.dot(x_centered)
+        
+        # Percentage change along the fitted line from first to last price
+        pct_change = slope * (p.size - 1) / p[0] * 100 if p[0] != 0 else 0
         
         # Determine trend
         if pct_change > 5:
@@ -165,17 +341,81 @@ class SentimentAnalyzer:
     """
     
     # Sentiment keywords
-    POSITIVE_KEYWORDS = {
+    POSITIVE_KEYWORDS = frozenset({
         "surge", "rally", "gain", "up", "rise", "bull", "strong", "outperform",
         "beat", "growth", "profit", "earnings", "success", "positive", "good",
         "excellent", "outstanding", "record", "high", "boost", "jump"
-    }
+    })
     
-    NEGATIVE_KEYWORDS = {
+    NEGATIVE_KEYWORDS = frozenset({
         "plunge", "crash", "fall", "down", "bear", "weak", "underperform",
         "miss", "loss", "decline", "negative", "bad", "poor", "worst", "low",
         "drop", "tumble", "slump", "sell-off", "concern", "risk"
-    }
+    })
+    
+    # Whole words only, with a plain inflection allowed ("gains", "falls", "jumped"),
+    # so "up" does not match inside "upset". Hyphenated words stay one token.
+    _KEYWORD_POLARITY = _keyword_polarity(
+        POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS, ("", "s", "es", "ed", "d", "ing")
+    )
+    _TOKEN_PATTERN = re.compile(r"[a-z]+(?:-[a-z]+)*")
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score(text_lower: str) -> Tuple[int, int]:
+        """
+        Count positive and negative keyword occurrences with one hash lookup per word.
+        
+        Memoized: the same articles come back across symbol lookups and
+        market-news calls, so repeats skip the scan.
+        
+        Args:
+            text_lower: Lowercased text
+        
+        Returns:
+            Tuple of (positive count, negative count)
+        """
+        polarity_of = SentimentAnalyzer._KEYWORD_POLARITY.get
+        counts = [0, 0]  # [negative, positive]
+        
+        for token in SentimentAnalyzer._TOKEN_PATTERN.findall(text_lower):
+            polarity = polarity_of(token)
+            if polarity is not None:
+                counts[polarity] += 1
+            elif "-" in token:
+                # "profit-taking" still counts "profit"; "sell-off" matched whole above
+                for part in token.split("-"):
+                    polarity = polarity_of(part)
+                    if polarity is not None:
+                        counts[polarity] += 1
+        
+        return counts[1], counts[0]
+    
+    @staticmethod
+    def _polarity(positive_count: int, negative_count: int) -> float:
+        """Turn keyword counts into a sentiment score between -1 and 1."""
+        total = positive_count + negative_count
+        if total == 0:
+            return 0.0
+        return (positive_count - negative_count) / total
+    
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """
+        Get keyword-count cache statistics.
+        
+        Returns:
+            Dictionary with cache size, hits, misses and hit rate
+        """
+        info = SentimentAnalyzer._score.cache_info()
+        lookups = info.hits + info.misses
+        
+        return {
+            "size": info.currsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0
+        }
     
     @staticmethod
     def analyze_text(text: str) -> Dict[str, Any]:
@@ -188,20 +428,10 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment analysis
         """
-        text_lower = text.lower()
-        
-        # Count positive and negative keywords
-        positive_count = sum(1 for keyword in SentimentAnalyzer.POSITIVE_KEYWORDS 
-                           if keyword in text_lower)
-        negative_count = sum(1 for keyword in SentimentAnalyzer.NEGATIVE_KEYWORDS 
-                           if keyword in text_lower)
+        positive_count, negative_count = SentimentAnalyzer._score(text.lower())
         
         # Calculate sentiment score (-1 to 1)
-        total = positive_count + negative_count
-        if total == 0:
-            sentiment_score = 0.0
-        else:
-            sentiment_score = (positive_count - negative_count) / total
+        sentiment_score = SentimentAnalyzer._polarity(positive_count, negative_count)
         
         # Determine sentiment label
         if sentiment_score > 0.2:
@@ -236,23 +466,36 @@ class SentimentAnalyzer:
                 "article_sentiments": []
             }
         
-        article_sentiments = []
-        scores = []
-        
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('summary', '')}"
-            sentiment_data = SentimentAnalyzer.analyze_text(text)
-            
-            article_sentiments.append({
+        texts = [
+            f"{article.get('title', '')} {article.get('summary', '')}".lower()
+            for article in articles
+        ]
+        scores = np.fromiter(
+            (SentimentAnalyzer._polarity(*SentimentAnalyzer._score(text)) for text in texts),
+            dtype=np.float64,
+            count=len(texts)
+        )
+        
+        # Label every article at once with the same thresholds as analyze_text
+        labels = np.where(
+            scores > 0.2, "positive", np.where(scores < -0.2, "negative", "neutral")
+        ).tolist()
+        
+        article_sentiments = [
+            {
                 "title": article.get("title", ""),
-                "sentiment": sentiment_data["sentiment"],
-                "score": sentiment_data["score"]
-            })
-            
-            scores.append(sentiment_data["score"])
+                "sentiment": label,
+                "score": score
+            }
+            for article, label, score in zip(articles, labels, scores.tolist())
+        ]
+        
+        # Building the stats dict is not free; skip it unless it will be logged
+        if app_logger.isEnabledFor(logging.DEBUG):
+            app_logger.debug("Sentiment cache: %s", SentimentAnalyzer.get_cache_stats())
         
         # Calculate average sentiment
-        average_score = np.mean(scores) if scores else 0.0
+        average_score = scores.mean()
         
         if average_score > 0.2:
             overall_sentiment = "positive"
@@ -4,10 +4,24 @@ Report generation tools for MCP.
 Generates analysis reports and recommendations.
 """
 
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
 from src.utils.logger import app_logger
 
+# Direction of each label's contribution to the recommendation score
+_TREND_SIGN = {"bullish": 1.0, "bearish": -1.0}
+_SENTIMENT_SIGN = {"positive": 1.0, "negative": -1.0}
+
+# Indexed by score direction + 1 (-1 sell, 0 hold, 1 buy)
+_ACTIONS = ("SELL", "HOLD", "BUY")
+
+# Keyed by RSI direction (1 oversold, -1 overbought)
+_RSI_RATIONALE = {
+    1: "Stock is oversold (RSI < 30)",
+    0: "",
+    -1: "Stock is overbought (RSI > 70)"
+}
+
 
 class ReportGenerator:
     """
@@ -21,7 +35,8 @@ class ReportGenerator:
         symbol: str,
         stock_data: Dict[str, Any],
         technical_analysis: Dict[str, Any],
-        news_sentiment: Dict[str, Any]
+        news_sentiment: Dict[str, Any],
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate comprehensive stock analysis report.
@@ -31,6 +46,7 @@ class ReportGenerator:
             stock_data: Current stock data
             technical_analysis: Technical analysis results
             news_sentiment: News sentiment analysis
+            timestamp: ISO timestamp shared by a batch of reports (default: now, UTC)
         
         Returns:
             Dictionary containing the analysis report
@@ -51,7 +67,7 @@ class ReportGenerator:
             
             report = {
                 "symbol": symbol,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
                 "current_price": stock_data.get("price", 0),
                 "currency": stock_data.get("currency", "USD"),
                 
@@ -115,54 +131,31 @@ class ReportGenerator:
         sentiment = news_sentiment.get("overall_sentiment", "neutral")
         sentiment_score = news_sentiment.get("average_score", 0)
         
-        # Calculate recommendation score
-        score = 0
-        
-        # Technical analysis contribution
-        if trend == "bullish":
-            score += trend_strength / 100 * 40
-        elif trend == "bearish":
-            score -= trend_strength / 100 * 40
-        
-        if rsi < 30:
-            score += 15  # Oversold
-        elif rsi > 70:
-            score -= 15  # Overbought
+        # RSI direction: 1 when oversold, -1 when overbought, 0 otherwise
+        rsi_direction = (rsi < 30) - (rsi > 70)
         
-        # Sentiment contribution
-        if sentiment == "positive":
-            score += abs(sentiment_score) * 30
-        elif sentiment == "negative":
-            score -= abs(sentiment_score) * 30
+        # Calculate recommendation score (trend 40%, RSI 15 points, sentiment 30%)
+        score = (
+            _TREND_SIGN.get(trend, 0.0) * trend_strength * 0.4
+            + 15.0 * rsi_direction
+            + _SENTIMENT_SIGN.get(sentiment, 0.0) * abs(sentiment_score) * 30.0
+        )
         
         # Determine action and confidence
-        if score > 20:
-            action = "BUY"
-            confidence = min(abs(score) / 100, 1.0)
-        elif score < -20:
-            action = "SELL"
-            confidence = min(abs(score) / 100, 1.0)
-        else:
-            action = "HOLD"
-            confidence = 0.5
+        direction = (score > 20) - (score < -20)
+        action = _ACTIONS[direction + 1]
+        confidence = min(abs(score) / 100, 1.0) if direction else 0.5
         
         # Generate rationale
-        rationale_parts = []
-        
-        if trend == "bullish":
-            rationale_parts.append(f"Strong {trend} trend ({trend_strength:.1f}% strength)")
-        elif trend == "bearish":
-            rationale_parts.append(f"Strong {trend} trend ({trend_strength:.1f}% strength)")
-        
-        if rsi < 30:
-            rationale_parts.append("Stock is oversold (RSI < 30)")
-        elif rsi > 70:
-            rationale_parts.append("Stock is overbought (RSI > 70)")
-        
-        if sentiment == "positive":
-            rationale_parts.append(f"Positive news sentiment ({sentiment_score:.2f})")
-        elif sentiment == "negative":
-            rationale_parts.append(f"Negative news sentiment ({sentiment_score:.2f})")
+        rationale_parts = [
+            part for part in (
+                f"Strong {trend} trend ({trend_strength:.1f}% strength)" if trend in _TREND_SIGN else "",
+                _RSI_RATIONALE[rsi_direction],
+                f"{sentiment.capitalize()} news sentiment ({sentiment_score:.2f})"
+                if sentiment in _SENTIMENT_SIGN else ""
+            )
+            if part
+        ]
         
         rationale = "; ".join(rationale_parts) if rationale_parts else "Mixed signals"
         
@@ -207,7 +200,8 @@ class ReportGenerator:
     @staticmethod
     def generate_comparison_report(
         symbols: list,
-        analyses: Dict[str, Dict[str, Any]]
+        analyses: Dict[str, Dict[str, Any]],
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate comparison report for multiple stocks.
@@ -215,13 +209,14 @@ class ReportGenerator:
         Args:
             symbols: List of stock symbols
             analyses: Dictionary of analyses for each symbol
+            timestamp: ISO timestamp shared with the compared reports (default: now, UTC)
         
         Returns:
             Comparison report
         """
         try:
             comparison = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
                 "symbols": symbols,
                 "stocks": []
             }
@@ -4,13 +4,16 @@ Financial news scraper tool for MCP.
 Retrieves financial news and market updates from public sources.
 """
 
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+import asyncio
+import re
+import aiohttp
 import feedparser
-import httpx
 from bs4 import BeautifulSoup
 from src.utils.logger import app_logger
 from src.utils.config import config
+from src.utils.cache import TTLCache, SingleFlight, open_disk_cache
+from src.utils.clock import cached_iso_now
 
 
 class NewsScraper:
@@ -22,7 +25,17 @@ class NewsScraper:
     
     def __init__(self):
         """Initialize the news scraper."""
-        self.client = httpx.Client(timeout=config.SCRAPING_TIMEOUT)
+        # Created on first use so it binds to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Parsed feeds by URL, shared by every symbol lookup within the TTL
+        self._feed_cache = TTLCache(64, config.FEED_TTL_SECONDS)
+        
+        # Raw feed bodies on disk, so restarts and other workers skip the download
+        self._disk = open_disk_cache("feeds")
+        
+        # Feeds currently being fetched, so concurrent lookups share one download
+        self._inflight = SingleFlight()
         
         # RSS feeds for financial news
         self.rss_feeds = {
@@ -32,6 +45,89 @@ class NewsScraper:
             "marketwatch": "https://feeds.marketwatch.com/marketwatch/topstories/"
         }
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=config.SCRAPING_TIMEOUT)
+            )
+        return self._session
+    
+    async def _fetch(self, url: str) -> bytes:
+        """
+        Download a feed body.
+        
+        Args:
+            url: Feed URL
+        
+        Returns:
+            Raw response body
+        """
+        async with self._get_session().get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+    
+    async def _fetch_and_parse(self, url: str) -> Any:
+        """
+        Get a parsed feed, downloading it only when cached nowhere.
+        
+        Parsed feeds are looked up in memory first, then raw bodies on disk;
+        concurrent misses for the same URL share one download and parse.
+        
+        Args:
+            url: Feed URL
+        
+        Returns:
+            Parsed feed
+        """
+        cached = self._feed_cache.get(url)
+        if cached is not None:
+            return cached
+        
+        return await self._inflight.run(url, lambda: self._load_feed(url))
+    
+    async def _load_feed(self, url: str) -> Any:
+        """
+        Load a feed from disk or the network, parse it and cache it in memory.
+        
+        Args:
+            url: Feed URL
+        
+        Returns:
+            Parsed feed
+        """
+        body = self._disk.get(url)
+        if body is None:
+            body = await self._fetch(url)
+            self._disk.set(url, body, expire=config.FEED_TTL_SECONDS)
+        
+        # feedparser is CPU-bound on bytes; keep it off the event loop
+        feed = await asyncio.to_thread(feedparser.parse, body)
+        
+        self._feed_cache.set(url, feed)
+        return feed
+    
+    async def _fetch_feeds(self) -> Dict[str, Any]:
+        """
+        Get all RSS feeds concurrently, each parsed as soon as it arrives.
+        
+        Returns:
+            Parsed feeds by source name; sources that failed are skipped
+        """
+        results = await asyncio.gather(
+            *(self._fetch_and_parse(url) for url in self.rss_feeds.values()),
+            return_exceptions=True
+        )
+        
+        feeds = {}
+        for source_name, result in zip(self.rss_feeds, results):
+            if isinstance(result, Exception):
+                app_logger.warning(f"Error fetching from {source_name}: {str(result)}")
+            else:
+                feeds[source_name] = result
+        
+        return feeds
+    
     async def get_news_for_symbol(
         self,
         symbol: str,
@@ -53,34 +149,34 @@ class NewsScraper:
             # Search for news mentioning the symbol
             search_url = "https://feeds.bloomberg.com/markets/news.rss"
             
-            for source_name, feed_url in self.rss_feeds.items():
-                try:
-                    feed = feedparser.parse(feed_url)
+            # Whole-word, case-insensitive match so "AA" does not hit "NASDAQ"
+            symbol_pattern = re.compile(
+                rf"(?<!\w){re.escape(symbol)}(?!\w)", re.IGNORECASE
+            )
+            
+            feeds = await self._fetch_feeds()
+            
+            for source_name, feed in feeds.items():
+                for entry in feed.entries[:limit]:
+                    # Check if symbol is mentioned in title or summary
+                    title = entry.get("title", "")
+                    summary = entry.get("summary", "")
                     
-                    for entry in feed.entries[:limit]:
-                        # Check if symbol is mentioned in title or summary
-                        title = entry.get("title", "").upper()
-                        summary = entry.get("summary", "").upper()
-                        
-                        if symbol.upper() in title or symbol.upper() in summary:
-                            articles.append({
-                                "source": source_name,
-                                "title": entry.get("title", ""),
-                                "summary": entry.get("summary", "")[:500],
-                                "link": entry.get("link", ""),
-                                "published": entry.get("published", ""),
-                                "author": entry.get("author", "")
-                            })
-                
-                except Exception as e:
-                    app_logger.warning(f"Error fetching from {source_name}: {str(e)}")
-                    continue
+                    if symbol_pattern.search(title) or symbol_pattern.search(summary):
+                        articles.append({
+                            "source": source_name,
+                            "title": title,
+                            "summary": summary[:500],
+                            "link": entry.get("link", ""),
+                            "published": entry.get("published", ""),
+                            "author": entry.get("author", "")
+                        })
             
             return {
                 "symbol": symbol,
                 "articles": articles[:limit],
                 "count": len(articles),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": cached_iso_now()
             }
         
         except Exception as e:
@@ -100,38 +196,46 @@ class NewsScraper:
         try:
             articles = []
             
-            for source_name, feed_url in self.rss_feeds.items():
-                try:
-                    feed = feedparser.parse(feed_url)
-                    
-                    for entry in feed.entries[:limit]:
-                        articles.append({
-                            "source": source_name,
-                            "title": entry.get("title", ""),
-                            "summary": entry.get("summary", "")[:500],
-                            "link": entry.get("link", ""),
-                            "published": entry.get("published", ""),
-                            "author": entry.get("author", "")
-                        })
-                
-                except Exception as e:
-                    app_logger.warning(f"Error fetching from {source_name}: {str(e)}")
-                    continue
+            feeds = await self._fetch_feeds()
+            
+            for source_name, feed in feeds.items():
+                for entry in feed.entries[:limit]:
+                    articles.append({
+                        "source": source_name,
+                        "title": entry.get("title", ""),
+                        "summary": entry.get("summary", "")[:500],
+                        "link": entry.get("link", ""),
+                        "published": entry.get("published", ""),
+                        "author": entry.get("author", "")
+                    })
             
             return {
                 "articles": articles[:limit],
                 "count": len(articles),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": cached_iso_now()
             }
         
         except Exception as e:
             app_logger.error(f"Error scraping market news: {str(e)}")
             raise
     
-    def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get feed cache statistics.
+        
+        Returns:
+            Dictionary with hits and misses of the memory and disk layers
+        """
+        disk_hits, disk_misses = self._disk.stats()
+        
+        return {
+            "memory": {"hits": self._feed_cache.hits, "misses": self._feed_cache.misses},
+            "disk": {"hits": disk_hits, "misses": disk_misses}
+        }
     
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        self.close()
+    async def aclose(self):
+        """Close the HTTP session and the disk cache."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._disk.close()
@@ -5,11 +5,64 @@ Retrieves stock price data, historical information, and basic metrics
 from public financial data sources.
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterable, List, Union
+from types import MappingProxyType
+import asyncio
+import random
 import httpx
+import numpy as np
+import orjson
 from src.utils.logger import app_logger
 from src.utils.config import config
+from src.utils.cache import SingleFlight, open_disk_cache
+from src.utils.clock import cached_iso_now
+
+
+# Child of the application logger, so it shares its handler but can be
+# filtered on its own
+logger = app_logger.getChild("scraper_stock")
+
+
+# Statuses worth retrying: rate limiting and transient upstream failures
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bound in seconds for one backoff wait
+_MAX_BACKOFF = 30.0
+
+# Chart range and bar interval for each supported period
+_PERIOD_MAP = MappingProxyType({
+    "1d": ("1d", "1m"),
+    "5d": ("5d", "15m"),
+    "1mo": ("1mo", "1d"),
+    "3mo": ("3mo", "1d"),
+    "6mo": ("6mo", "1d"),
+    "1y": ("1y", "1d"),
+    "2y": ("2y", "1wk"),
+    "5y": ("5y", "1wk"),
+    "10y": ("10y", "1mo")
+})
+
+# Disk cache lifetime in seconds for intraday periods, one bar of their
+# interval; daily and longer periods use config.HISTORY_CACHE_TTL
+_INTRADAY_CACHE_TTL = MappingProxyType({
+    "1d": 60,
+    "5d": 900
+})
+
+
+def _raw_value(module: Dict[str, Any], field: str) -> Any:
+    """
+    Read the raw number of a quoteSummary field.
+    
+    Args:
+        module: quoteSummary module, e.g. ``summaryDetail``
+        field: Field name within the module
+    
+    Returns:
+        The field's ``raw`` value, or 0 when the field is missing
+    """
+    value = module.get(field)
+    return value.get("raw", 0) if value else 0
 
 
 class StockScraper:
@@ -22,8 +75,104 @@ class StockScraper:
     
     def __init__(self):
         """Initialize the stock scraper."""
-        self.client = httpx.Client(timeout=config.SCRAPING_TIMEOUT)
+        self.client = httpx.AsyncClient(
+            timeout=config.SCRAPING_TIMEOUT,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
         self.base_url = "https://query1.finance.yahoo.com"
+        
+        # Parsed responses on disk; Yahoo rate-limits and quotes stay valid for a minute
+        self._disk = open_disk_cache("stocks")
+        
+        # Requests currently being fetched, shared by concurrent callers of the same key
+        self._inflight = SingleFlight()
+        
+        # Caps simultaneous requests to Yahoo so bursts do not trip its rate limiter
+        self._request_semaphore = asyncio.Semaphore(config.SCRAPING_CONCURRENCY)
+    
+    @staticmethod
+    def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Compute how long to wait before retrying a request.
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            response: Failed response, whose Retry-After header is honoured
+        
+        Returns:
+            Delay in seconds
+        """
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            return min(_MAX_BACKOFF, float(retry_after))
+        
+        # Exponential backoff with jitter so retries from concurrent callers spread out
+        return min(_MAX_BACKOFF, 2 ** attempt) + random.random()
+    
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        GET a Yahoo endpoint, retrying rate-limited and transient failures.
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+        
+        Returns:
+            Successful response
+        
+        Raises:
+            httpx.HTTPError: If the request still fails after MAX_RETRIES retries
+        """
+        for attempt in range(config.MAX_RETRIES + 1):
+            last_attempt = attempt == config.MAX_RETRIES
+            try:
+                async with self._request_semaphore:
+                    response = await self.client.get(url, params=params)
+                response.raise_for_status()
+                return response
+            
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _RETRY_STATUSES or last_attempt:
+                    raise
+                delay = self._retry_delay(attempt, e.response)
+            
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = self._retry_delay(attempt)
+            
+            # Sleep outside the semaphore so waiting retries do not hold a slot
+            logger.warning("Retrying %s in %.1fs (attempt %d)", url, delay, attempt + 1)
+            await asyncio.sleep(delay)
+    
+    async def _cached_fetch(
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Return a cached response, or fetch it once for all concurrent callers.
+        
+        Args:
+            key: Cache key
+            ttl: Seconds the fetched response stays in the disk cache
+            fetch: Coroutine function performing the actual request
+        
+        Returns:
+            Response data
+        """
+        cached = self._disk.get(key)
+        if cached is not None:
+            return cached
+        
+        async def fetch_and_store() -> Dict[str, Any]:
+            result = await fetch()
+            self._disk.set(key, result, expire=ttl)
+            return result
+        
+        return await self._inflight.run(key, fetch_and_store)
     
     async def get_stock_data(self, symbol: str) -> Dict[str, Any]:
         """
@@ -32,6 +181,45 @@ class StockScraper:
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL', 'MSFT')
         
+        Returns:
+            Dictionary containing stock data
+        """
+        # Cached entries are shared by every spelling, so store the canonical one
+        symbol = symbol.upper()
+        return await self._cached_fetch(
+            f"quote:{symbol}",
+            config.QUOTE_CACHE_TTL,
+            lambda: self._fetch_stock_data(symbol)
+        )
+    
+    async def get_stock_data_many(
+        self,
+        symbols: Iterable[str]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Get current stock data for several symbols concurrently.
+        
+        Requests run in parallel, still bounded by the scraper's request limit.
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            One entry per symbol, in order: its stock data, or the exception
+            raised while fetching it
+        """
+        return await asyncio.gather(
+            *(self.get_stock_data(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+    
+    async def _fetch_stock_data(self, symbol: str) -> Dict[str, Any]:
+        """
+        Download current stock data for a symbol.
+        
+        Args:
+            symbol: Stock ticker symbol
+        
         Returns:
             Dictionary containing stock data
         """
@@ -42,30 +230,33 @@ class StockScraper:
                 "modules": "price,summaryDetail,financialData"
             }
             
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
+            response = await self._get(url, params)
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if "quoteSummary" not in data or "result" not in data["quoteSummary"]:
                 raise ValueError(f"No data found for symbol {symbol}")
             
             result = data["quoteSummary"]["result"][0]
             
+            # Bind each module once; missing ones fall back to a single empty dict
+            price = result.get("price") or {}
+            summary = result.get("summaryDetail") or {}
+            
             return {
                 "symbol": symbol,
-                "price": result.get("price", {}).get("regularMarketPrice", {}).get("raw", 0),
-                "currency": result.get("price", {}).get("currency", "USD"),
-                "market_cap": result.get("summaryDetail", {}).get("marketCap", {}).get("raw", 0),
-                "pe_ratio": result.get("summaryDetail", {}).get("trailingPE", {}).get("raw", 0),
-                "dividend_yield": result.get("summaryDetail", {}).get("dividendYield", {}).get("raw", 0),
-                "fifty_two_week_high": result.get("summaryDetail", {}).get("fiftyTwoWeekHigh", {}).get("raw", 0),
-                "fifty_two_week_low": result.get("summaryDetail", {}).get("fiftyTwoWeekLow", {}).get("raw", 0),
-                "timestamp": datetime.now().isoformat()
+                "price": _raw_value(price, "regularMarketPrice"),
+                "currency": price.get("currency", "USD"),
+                "market_cap": _raw_value(summary, "marketCap"),
+                "pe_ratio": _raw_value(summary, "trailingPE"),
+                "dividend_yield": _raw_value(summary, "dividendYield"),
+                "fifty_two_week_high": _raw_value(summary, "fiftyTwoWeekHigh"),
+                "fifty_two_week_low": _raw_value(summary, "fiftyTwoWeekLow"),
+                "timestamp": cached_iso_now()
             }
         
         except Exception as e:
-            app_logger.error(f"Error scraping stock data for {symbol}: {str(e)}")
+            logger.error("Error scraping stock data for %s: %s", symbol, e)
             raise
     
     async def get_historical_data(
@@ -81,72 +272,115 @@ class StockScraper:
             period: Time period ('1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y')
         
         Returns:
-            Dictionary containing historical data
+            Dictionary containing historical data as columns: ``dates`` (list of
+            str), float64 arrays ``open``, ``high``, ``low``, ``close`` and
+            ``adj_close`` (NaN where missing), and an int64 ``volume`` array
+        """
+        symbol = symbol.upper()
+        return await self._cached_fetch(
+            f"history:{symbol}:{period}",
+            _INTRADAY_CACHE_TTL.get(period, config.HISTORY_CACHE_TTL),
+            lambda: self._fetch_historical_data(symbol, period)
+        )
+    
+    async def get_historical_data_many(
+        self,
+        symbols: Iterable[str],
+        period: str = "1y"
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Get historical stock data for several symbols concurrently.
+        
+        Args:
+            symbols: Stock ticker symbols
+            period: Time period, as for get_historical_data
+        
+        Returns:
+            One entry per symbol, in order: its historical data, or the
+            exception raised while fetching it
+        """
+        return await asyncio.gather(
+            *(self.get_historical_data(symbol, period) for symbol in symbols),
+            return_exceptions=True
+        )
+    
+    async def _fetch_historical_data(self, symbol: str, period: str) -> Dict[str, Any]:
+        """
+        Download historical stock data.
+        
+        Args:
+            symbol: Stock ticker symbol
+            period: Time period
+        
+        Returns:
+            Dictionary containing historical data as columns
         """
         try:
-            url = f"{self.base_url}/v7/finance/download/{symbol}"
-            
-            # Map period to interval
-            period_map = {
-                "1d": ("1d", "1m"),
-                "5d": ("5d", "15m"),
-                "1mo": ("1mo", "1d"),
-                "3mo": ("3mo", "1d"),
-                "6mo": ("6mo", "1d"),
-                "1y": ("1y", "1d"),
-                "2y": ("2y", "1wk"),
-                "5y": ("5y", "1wk"),
-                "10y": ("10y", "1mo")
-            }
+            url = f"{self.base_url}/v8/finance/chart/{symbol}"
             
-            period_val, interval = period_map.get(period, ("1y", "1d"))
+            period_val, interval = _PERIOD_MAP.get(period, ("1y", "1d"))
             
             params = {
-                "period1": int((datetime.now() - timedelta(days=365)).timestamp()),
-                "period2": int(datetime.now().timestamp()),
+                "range": period_val,
                 "interval": interval,
                 "events": "history"
             }
             
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
+            response = await self._get(url, params)
             
-            # Parse CSV response
-            lines = response.text.strip().split('\n')
-            if len(lines) < 2:
+            # Parse the raw body directly; the chart payload is the bulk of the
+            # transfer and never needs to exist as a decoded str
+            data = orjson.loads(response.content)
+            results = (data.get("chart") or {}).get("result") or []
+            if not results or not results[0].get("timestamp"):
                 raise ValueError(f"No historical data found for {symbol}")
             
-            headers = lines[0].split(',')
-            data_points = []
-            
-            for line in lines[1:]:
-                values = line.split(',')
-                data_points.append({
-                    "date": values[0],
-                    "open": float(values[1]) if values[1] != "null" else None,
-                    "high": float(values[2]) if values[2] != "null" else None,
-                    "low": float(values[3]) if values[3] != "null" else None,
-                    "close": float(values[4]) if values[4] != "null" else None,
-                    "volume": int(values[5]) if values[5] != "null" else 0,
-                    "adj_close": float(values[6]) if values[6] != "null" else None
-                })
+            # The chart payload is already columnar: one JSON array per field,
+            # with null for missing values, so each column converts in one call
+            result = results[0]
+            indicators = result["indicators"]
+            quote = indicators["quote"][0]
+            prices = {
+                name: np.asarray(quote[name], dtype=np.float64)
+                for name in ("open", "high", "low", "close")
+            }
+            # Intraday intervals carry no adjusted close
+            adjclose = indicators.get("adjclose")
+            prices["adj_close"] = (
+                np.asarray(adjclose[0]["adjclose"], dtype=np.float64)
+                if adjclose else prices["close"].copy()
+            )
+            
+            timestamps = np.asarray(result["timestamp"], dtype=np.int64)
+            dates = np.datetime_as_string(
+                timestamps.astype("datetime64[s]"),
+                unit="m" if interval.endswith("m") else "D"
+            ).tolist()
+            volume = np.nan_to_num(np.asarray(quote["volume"], dtype=np.float64))
             
             return {
                 "symbol": symbol,
                 "period": period,
-                "data_points": data_points,
-                "count": len(data_points),
-                "timestamp": datetime.now().isoformat()
+                "dates": dates,
+                **prices,
+                "volume": volume.astype(np.int64),
+                "count": len(dates),
+                "timestamp": cached_iso_now()
             }
         
         except Exception as e:
-            app_logger.error(f"Error scraping historical data for {symbol}: {str(e)}")
+            logger.error("Error scraping historical data for %s: %s", symbol, e)
             raise
     
-    def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+    async def aclose(self):
+        """Close the HTTP client and the disk cache."""
+        await self.client.aclose()
+        self._disk.close()
+    
+    async def __aenter__(self) -> "StockScraper":
+        """Use the scraper as ``async with StockScraper() as scraper:``."""
+        return self
     
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        self.close()
+    async def __aexit__(self, *exc_info):
+        """Close the HTTP client when leaving the ``async with`` block."""
+        await self.aclose()
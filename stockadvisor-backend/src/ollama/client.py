@@ -4,13 +4,18 @@ Ollama client module for StockAdvisor+ Bot.
 Handles communication with the local Ollama LLM service.
 """
 
-import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, AsyncIterator
 import httpx
+import orjson
 from src.utils.logger import app_logger
 from src.utils.config import config
 
 
+# Child of the application logger, so it shares its handler but can be
+# filtered on its own
+logger = app_logger.getChild("ollama")
+
+
 class OllamaClient:
     """
     Client for interacting with Ollama LLM service.
@@ -28,8 +33,20 @@ class OllamaClient:
         """
         self.host = host or config.OLLAMA_HOST
         self.model = model or config.OLLAMA_MODEL
-        self.client = httpx.Client(timeout=30.0)
-        app_logger.info(f"Ollama client initialized: {self.host} with model {self.model}")
+        # One pooled async client reused by every call keeps connections alive
+        # between the back-to-back generations of a chat turn. HTTP/2 is
+        # negotiated when the host is served over TLS (e.g. behind a proxy).
+        self._client = httpx.AsyncClient(
+            base_url=self.host,
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=16,
+                max_connections=32,
+                keepalive_expiry=60.0
+            )
+        )
+        logger.info("Ollama client initialized: %s with model %s", self.host, self.model)
     
     async def generate(
         self,
@@ -37,7 +54,8 @@ class OllamaClient:
         system: Optional[str] = None,
         temperature: float = 0.7,
         top_p: float = 0.9,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        format: Optional[str] = None
     ) -> str:
         """
         Generate text completion using Ollama.
@@ -48,28 +66,50 @@ class OllamaClient:
             temperature: Sampling temperature (0-1)
             top_p: Top-p sampling parameter
             max_tokens: Maximum tokens to generate
+            format: Output format constraint (e.g. 'json')
         
         Returns:
             Generated text response
         
+        Raises:
+            Exception: If Ollama service is unavailable
+        """
+        message = await self.chat(
+            self._build_messages(prompt, system),
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            format=format
+        )
+        return message.get("content", "")
+    
+    async def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        max_tokens: int = 2048,
+        format: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a chat completion, optionally offering tools to the model.
+        
+        Args:
+            messages: Chat messages ('system', 'user', 'assistant' or 'tool' roles)
+            tools: Function tool definitions the model may call
+            temperature: Sampling temperature (0-1)
+            top_p: Top-p sampling parameter
+            max_tokens: Maximum tokens to generate
+            format: Output format constraint (e.g. 'json')
+        
+        Returns:
+            Assistant message with 'content' and, when tools were called, 'tool_calls'
+        
         Raises:
             Exception: If Ollama service is unavailable
         """
         try:
-            messages = []
-            
-            if system:
-                messages.append({
-                    "role": "system",
-                    "content": system
-                })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
-            
-            url = f"{self.host}/api/chat"
             payload = {
                 "model": self.model,
                 "messages": messages,
@@ -81,17 +121,23 @@ class OllamaClient:
                 }
             }
             
-            response = self.client.post(url, json=payload)
+            if tools:
+                payload["tools"] = tools
+            
+            if format:
+                payload["format"] = format
+            
+            response = await self._client.post("/api/chat", json=payload)
             response.raise_for_status()
             
-            result = response.json()
-            return result.get("message", {}).get("content", "")
+            result = orjson.loads(response.content)
+            return result.get("message", {})
         
         except httpx.ConnectError:
-            app_logger.error(f"Failed to connect to Ollama at {self.host}")
+            logger.error("Failed to connect to Ollama at %s", self.host)
             raise Exception("Ollama service is not available")
         except Exception as e:
-            app_logger.error(f"Error generating text: {str(e)}")
+            logger.error("Error generating text: %s", e)
             raise
     
     async def generate_streaming(
@@ -111,21 +157,51 @@ class OllamaClient:
         Yields:
             Text chunks as they are generated
         """
+        async for content in self.chat_streaming(
+            self._build_messages(prompt, system),
+            temperature=temperature
+        ):
+            yield content
+    
+    async def chat_streaming(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: float = 0.7
+    ):
+        """
+        Run a chat completion with streaming response.
+        
+        Args:
+            messages: Chat messages
+            temperature: Sampling temperature
+        
+        Yields:
+            Text chunks as they are generated
+        """
+        async for message in self.chat_streaming_messages(messages, temperature=temperature):
+            content = message.get("content", "")
+            if content:
+                yield content
+    
+    async def chat_streaming_messages(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a chat completion, streaming the assistant message frame by frame.
+        
+        Args:
+            messages: Chat messages
+            tools: Function tool definitions the model may call
+            temperature: Sampling temperature
+        
+        Yields:
+            Assistant message of each streamed frame, with a 'content' delta
+            and, when the model calls tools, 'tool_calls'
+        """
         try:
-            messages = []
-            
-            if system:
-                messages.append({
-                    "role": "system",
-                    "content": system
-                })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
-            
-            url = f"{self.host}/api/chat"
             payload = {
                 "model": self.model,
                 "messages": messages,
@@ -133,21 +209,69 @@ class OllamaClient:
                 "stream": True
             }
             
-            with self.client.stream("POST", url, json=payload) as response:
+            if tools:
+                payload["tools"] = tools
+            
+            async with self._client.stream("POST", "/api/chat", json=payload) as response:
                 response.raise_for_status()
                 
-                for line in response.iter_lines():
-                    if line:
-                        data = json.loads(line)
-                        content = data.get("message", {}).get("content", "")
-                        if content:
-                            yield content
+                async for line in self._iter_ndjson_lines(response):
+                    yield orjson.loads(line).get("message", {})
         
         except Exception as e:
-            app_logger.error(f"Error in streaming generation: {str(e)}")
+            logger.error("Error in streaming generation: %s", e)
             raise
     
-    def health_check(self) -> bool:
+    @staticmethod
+    async def _iter_ndjson_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+        """
+        Split a streamed NDJSON body into lines without decoding it to str.
+        
+        Args:
+            response: Streaming HTTP response
+        
+        Yields:
+            Non-empty raw lines
+        """
+        buffer = b""
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        
+        if buffer.strip():
+            yield buffer
+    
+    @staticmethod
+    def _build_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a single prompt.
+        
+        Args:
+            prompt: The user prompt
+            system: System message to set context
+        
+        Returns:
+            List of chat messages
+        """
+        messages = []
+        
+        if system:
+            messages.append({
+                "role": "system",
+                "content": system
+            })
+        
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+        
+        return messages
+    
+    async def health_check(self) -> bool:
         """
         Check if Ollama service is available.
         
@@ -155,17 +279,12 @@ class OllamaClient:
             True if service is available, False otherwise
         """
         try:
-            url = f"{self.host}/api/tags"
-            response = self.client.get(url, timeout=5.0)
+            response = await self._client.get("/api/tags", timeout=1.0)
             return response.status_code == 200
         except Exception as e:
-            app_logger.warning(f"Ollama health check failed: {str(e)}")
+            logger.warning("Ollama health check failed: %s", e)
             return False
     
-    def close(self):
-        """Close the HTTP client connection."""
-        self.client.close()
-    
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        self.close()
+    async def close(self):
+        """Close the HTTP client connections."""
+        await self._client.aclose()
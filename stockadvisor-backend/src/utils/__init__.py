@@ -4,5 +4,7 @@ Utilities package for StockAdvisor+ Bot backend.
 
 from .config import config
 from .logger import app_logger, setup_logger
+from .clock import cached_iso_now
+from .cache import TTLCache, SingleFlight, open_disk_cache
 
-__all__ = ["config", "app_logger", "setup_logger"]
+__all__ = ["config", "app_logger", "setup_logger", "cached_iso_now", "TTLCache", "SingleFlight", "open_disk_cache"]
@@ -0,0 +1,160 @@
+"""
+Cache utilities for StockAdvisor+ Bot backend.
+
+Provides a small in-memory cache with size and age limits, on-disk caches
+shared across restarts and worker processes, and a helper that coalesces
+concurrent requests for the same key.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import diskcache
+from src.utils.config import config
+
+
+def open_disk_cache(name: str, size_limit: int = 256 << 20) -> diskcache.Cache:
+    """
+    Open a named on-disk cache under ``config.CACHE_DIR``.
+    
+    Hit/miss statistics are enabled and can be read with ``cache.stats()``.
+    
+    Args:
+        name: Subdirectory of the cache directory
+        size_limit: Maximum size in bytes before entries are culled
+    
+    Returns:
+        Disk-backed cache
+    """
+    cache = diskcache.Cache(os.path.join(config.CACHE_DIR, name), size_limit=size_limit)
+    cache.stats(enable=True)
+    return cache
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed time.
+    
+    Expired entries are dropped lazily when they are looked up.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after being stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+        
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        entry = self._data.get(key)
+        
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry when full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove a value.
+        
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing
+        
+        Returns:
+            Removed value or default
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+    
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    Run at most one operation per key at a time, sharing it with every caller.
+    
+    The operation runs as its own task, so cancelling any caller, including
+    the one that started it, never cancels the work the others wait on.
+    """
+    
+    def __init__(self):
+        """Initialize with no operations in flight."""
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+    
+    async def run(self, key: Hashable, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the operation in flight for key, starting it if there is none.
+        
+        Args:
+            key: Operation key
+            operation: Coroutine function started when no operation is in flight
+        
+        Returns:
+            Result of the shared operation
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(operation())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        
+        # Shielded so a cancelled caller only stops waiting
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        """Forget a finished task and mark its exception as retrieved."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        
+        # Every caller may have been cancelled; avoid "never retrieved" noise
+        if not task.cancelled():
+            task.exception()
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
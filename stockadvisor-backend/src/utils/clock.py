@@ -0,0 +1,30 @@
+"""
+Clock utilities for StockAdvisor+ Bot backend.
+
+Provides cheap formatted timestamps for hot request paths.
+"""
+
+import time
+from datetime import datetime, timezone
+
+# (epoch second, ISO string) of the last formatted timestamp
+_ts_cache = (0, "")
+
+
+def cached_iso_now() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string.
+    
+    The string is formatted at most once per second and shared by every
+    caller within that second.
+    
+    Returns:
+        Current UTC time with second resolution and a ``+00:00`` offset
+    """
+    global _ts_cache
+    
+    second = int(time.time())
+    if _ts_cache[0] != second:
+        _ts_cache = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+    
+    return _ts_cache[1]
@@ -6,23 +6,29 @@ settings for the entire application.
 """
 
 import os
+from dataclasses import dataclass
+from typing import Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
     """
     Application configuration class.
     
     Loads all configuration from environment variables with sensible defaults.
+    Values are parsed once at import time; the instance is immutable so it can
+    be shared freely across tasks and threads.
     """
     
     # Backend Settings
     BACKEND_HOST: str = os.getenv("BACKEND_HOST", "0.0.0.0")
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
     
     # Ollama Settings
     OLLAMA_HOST: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
@@ -37,10 +43,35 @@ class Config:
     # Scraping Configuration
     SCRAPING_DELAY: int = int(os.getenv("SCRAPING_DELAY", "2"))
     SCRAPING_TIMEOUT: int = int(os.getenv("SCRAPING_TIMEOUT", "10"))
-    MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
+    MAX_RETRIES: int = max(0, int(os.getenv("MAX_RETRIES", "3")))
+    SCRAPING_CONCURRENCY: int = int(os.getenv("SCRAPING_CONCURRENCY", "16"))
+    QUOTE_CACHE_TTL: int = int(os.getenv("QUOTE_CACHE_TTL", "60"))
+    HISTORY_CACHE_TTL: int = int(os.getenv("HISTORY_CACHE_TTL", "86400"))
+    FEED_TTL_SECONDS: int = int(os.getenv("FEED_TTL_SECONDS", "60"))
+    
+    # On-disk cache shared by restarts and worker processes
+    CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")
+    
+    # Analysis Cache
+    ANALYSIS_CACHE_TTL: int = int(os.getenv("ANALYSIS_CACHE_TTL", "900"))
+    ANALYSIS_CACHE_SIZE: int = int(os.getenv("ANALYSIS_CACHE_SIZE", "1024"))
+    MAX_CONCURRENT_ANALYSES: int = int(os.getenv("MAX_CONCURRENT_ANALYSES", "5"))
+    
+    # Conversation Contexts
+    CONTEXT_MAX_USERS: int = int(os.getenv("CONTEXT_MAX_USERS", "10000"))
+    CONTEXT_IDLE_TIMEOUT: int = int(os.getenv("CONTEXT_IDLE_TIMEOUT", "3600"))
+    CONTEXT_EVICTION_INTERVAL: int = int(os.getenv("CONTEXT_EVICTION_INTERVAL", "60"))
+    SUMMARY_INTERVAL: int = int(os.getenv("SUMMARY_INTERVAL", "3"))
+    
+    # Redis (shared context store, disabled when empty)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
     
     # News Sources
-    NEWS_SOURCES: list = os.getenv("NEWS_SOURCES", "reuters,bloomberg,cnbc").split(",")
+    NEWS_SOURCES: Tuple[str, ...] = tuple(
+        source.strip()
+        for source in os.getenv("NEWS_SOURCES", "reuters,bloomberg,cnbc").split(",")
+        if source.strip()
+    )
     
     # API Keys
     ALPHA_VANTAGE_KEY: str = os.getenv("ALPHA_VANTAGE_KEY", "")
@@ -9,10 +9,17 @@ import sys
 from datetime import datetime
 
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Setup and configure a logger instance.
     
+    Returns the existing logger untouched when it already has handlers, so
+    repeated calls do not build and discard handler objects.
+    
     Args:
         name: Logger name (typically __name__)
         level: Logging level (default: INFO)
@@ -21,23 +28,17 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         Configured logger instance
     """
     logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+    
     logger.setLevel(level)
     
     # Create console handler with formatting
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
     
-    # Create formatter
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    handler.setFormatter(formatter)
-    
-    # Add handler to logger if not already present
-    if not logger.handlers:
-        logger.addHandler(handler)
+    logger.addHandler(handler)
     
     return logger
 
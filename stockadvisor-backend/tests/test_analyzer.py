@@ -36,6 +36,15 @@ class TestTechnicalAnalyzer:
         assert 0 <= rsi <= 100
         assert rsi < 50  # Should be low for downtrend
     
+    def test_calculate_rsi_series(self):
+        """Test that the RSI series starts from the calculate_rsi seed."""
+        prices = [100, 101, 99, 102, 104, 103, 105, 104, 106, 108, 107, 109, 108, 110, 111, 109, 112, 113]
+        series = TechnicalAnalyzer.calculate_rsi_series(prices, period=14)
+        
+        assert len(series) == len(prices) - 14
+        assert series[0] == pytest.approx(TechnicalAnalyzer.calculate_rsi(prices, period=14))
+        assert all(0 <= x <= 100 for x in series)
+    
     def test_calculate_macd(self):
         """Test MACD calculation."""
         prices = [100 + i for i in range(50)]
@@ -46,6 +55,15 @@ class TestTechnicalAnalyzer:
         assert "histogram" in macd
         assert isinstance(macd["macd"], float)
     
+    def test_calculate_macd_signal_lags(self):
+        """Test that the signal line is an EMA of the MACD line, not a copy of it."""
+        prices = [100 + 0.1 * i * i for i in range(60)]  # Accelerating uptrend
+        macd = TechnicalAnalyzer.calculate_macd(prices)
+        
+        assert macd["macd"] > macd["signal"]
+        assert macd["histogram"] == pytest.approx(macd["macd"] - macd["signal"])
+        assert macd["histogram"] > 0
+    
     def test_analyze_trend_bullish(self):
         """Test trend analysis for bullish trend."""
         prices = [100, 102, 104, 106, 108, 110]
@@ -70,6 +88,13 @@ class TestTechnicalAnalyzer:
         trend = TechnicalAnalyzer.analyze_trend(prices)
         
         assert trend["trend"] == "neutral"
+    
+    def test_analyze_trend_ignores_endpoint_spike(self):
+        """Test that the trend follows the whole series, not only its endpoints."""
+        prices = [100, 104, 108, 112, 116, 120, 124, 128, 100]  # Last-day drop back to start
+        trend = TechnicalAnalyzer.analyze_trend(prices)
+        
+        assert trend["trend"] == "bullish"
 
 
 class TestSentimentAnalyzer:
@@ -101,6 +126,13 @@ class TestSentimentAnalyzer:
         assert sentiment["sentiment"] == "neutral"
         assert sentiment["score"] == 0
     
+    def test_analyze_text_word_boundaries(self):
+        """Test that keywords only match whole words or simple inflections."""
+        sentiment = SentimentAnalyzer.analyze_text("Investors upset as shares tumbled")
+        
+        assert sentiment["positive_keywords"] == 0  # "up" inside "upset"
+        assert sentiment["negative_keywords"] == 1
+    
     def test_analyze_news_sentiment(self):
         """Test sentiment analysis for news articles."""
         articles = [
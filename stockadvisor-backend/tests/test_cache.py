@@ -0,0 +1,43 @@
+"""
+Unit tests for the cache utilities.
+
+Tests expiry and size bounds of the TTL cache.
+"""
+
+import time
+from src.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+    
+    def test_get_and_set(self):
+        """Test storing and retrieving values."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("AAPL", {"price": 100})
+        
+        assert cache.get("AAPL") == {"price": 100}
+        assert cache.get("MSFT") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("AAPL", 1)
+        time.sleep(0.02)
+        
+        assert cache.get("AAPL") is None
+        assert len(cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("A", 1)
+        cache.set("B", 2)
+        cache.get("A")
+        cache.set("C", 3)
+        
+        assert cache.get("A") == 1
+        assert cache.get("B") is None
+        assert cache.get("C") == 3
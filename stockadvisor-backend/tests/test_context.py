@@ -28,8 +28,8 @@ class TestConversationContext:
         context.add_message("user", "Hello")
         
         assert len(context.messages) == 1
-        assert context.messages[0]["role"] == "user"
-        assert context.messages[0]["content"] == "Hello"
+        assert context.messages[0].role == "user"
+        assert context.messages[0].content == "Hello"
     
     def test_add_multiple_messages(self, context):
         """Test adding multiple messages."""
@@ -38,9 +38,9 @@ class TestConversationContext:
         context.add_message("user", "How are you?")
         
         assert len(context.messages) == 3
-        assert context.messages[0]["role"] == "user"
-        assert context.messages[1]["role"] == "assistant"
-        assert context.messages[2]["role"] == "user"
+        assert context.messages[0].role == "user"
+        assert context.messages[1].role == "assistant"
+        assert context.messages[2].role == "user"
     
     def test_get_conversation_history(self, context):
         """Test retrieving conversation history."""
@@ -50,8 +50,8 @@ class TestConversationContext:
         history = context.get_conversation_history()
         
         assert len(history) == 2
-        assert history[0]["content"] == "Message 1"
-        assert history[1]["content"] == "Response 1"
+        assert history[0].content == "Message 1"
+        assert history[1].content == "Response 1"
     
     def test_get_conversation_history_with_limit(self, context):
         """Test retrieving conversation history with limit."""
@@ -61,8 +61,8 @@ class TestConversationContext:
         history = context.get_conversation_history(limit=2)
         
         assert len(history) == 2
-        assert history[0]["content"] == "Message 3"
-        assert history[1]["content"] == "Message 4"
+        assert history[0].content == "Message 3"
+        assert history[1].content == "Message 4"
     
     def test_add_watched_stock(self, context):
         """Test adding watched stocks."""
@@ -151,4 +151,18 @@ class TestConversationContext:
         assert context_dict["user_id"] == "test_user"
         assert len(context_dict["messages"]) == 1
         assert "AAPL" in context_dict["watched_stocks"]
-        assert context_dict["user_preferences"]["risk_level"] == "high"
\ No newline at end of file
+        assert context_dict["user_preferences"]["risk_level"] == "high"
+    
+    def test_context_from_dict(self, context):
+        """Test restoring context from its dictionary form."""
+        context.add_message("user", "Hello")
+        context.add_watched_stock("AAPL")
+        context.set_preference("risk_level", "high")
+        
+        restored = ConversationContext.from_dict(context.to_dict())
+        
+        assert restored.user_id == "test_user"
+        assert restored.messages[0].content == "Hello"
+        assert restored.watched_stocks == ["AAPL"]
+        assert restored.user_preferences["risk_level"] == "high"
+        assert restored.last_activity == context.last_activity
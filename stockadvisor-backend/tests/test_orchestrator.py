@@ -0,0 +1,269 @@
+"""
+Unit tests for the agent orchestrator.
+
+Tests tool-decision parsing, tool execution, context eviction and replies.
+"""
+
+from datetime import timedelta
+import pytest
+from src.agent.context import ConversationContext
+from src.agent.orchestrator import AgentOrchestrator
+
+
+class FakeMCPServer:
+    """MCP server stub recording the tool calls it receives."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def analyze_stock(self, symbol):
+        self.calls.append(("analyze_stock", symbol))
+        return {"success": True, "symbol": symbol}
+    
+    async def compare_stocks(self, symbols):
+        self.calls.append(("compare_stocks", symbols))
+        return {"success": True, "symbols": symbols}
+    
+    async def get_market_news(self, limit=20):
+        self.calls.append(("get_market_news", limit))
+        return {"success": True, "articles": []}
+
+
+class FakeOllamaClient:
+    """Ollama client stub replaying scripted chat replies."""
+    
+    def __init__(self, frames, final_reply="Final answer"):
+        self.frames = frames
+        self.final_reply = final_reply
+        self.requests = []
+    
+    async def chat(self, messages, tools=None, temperature=0.7):
+        self.requests.append(list(messages))
+        if tools and not any(message["role"] == "tool" for message in messages):
+            return {
+                "content": "".join(frame.get("content", "") for frame in self.frames),
+                "tool_calls": [call for frame in self.frames for call in frame.get("tool_calls", [])]
+            }
+        return {"content": self.final_reply}
+    
+    async def chat_streaming_messages(self, messages, tools=None, temperature=0.7):
+        self.requests.append(list(messages))
+        for frame in self.frames:
+            yield frame
+    
+    async def chat_streaming(self, messages, temperature=0.7):
+        self.requests.append(list(messages))
+        for word in self.final_reply.split(" "):
+            yield word + " "
+
+
+class TestAgentOrchestrator:
+    """Tests for AgentOrchestrator."""
+    
+    @pytest.fixture
+    def mcp(self):
+        """Create an MCP server stub."""
+        return FakeMCPServer()
+    
+    @pytest.fixture
+    def orchestrator(self, mcp):
+        """Create an orchestrator instance for testing."""
+        return AgentOrchestrator(None, mcp)
+    
+    def test_parse_tool_decision_json(self, orchestrator):
+        """Test parsing a bare JSON tool decision."""
+        response = '{"tools": ["analyze_stock(\\"AAPL\\")"], "reasoning": "User asked about Apple"}'
+        
+        assert orchestrator._parse_tool_decision(response) == ['analyze_stock("AAPL")']
+    
+    def test_parse_tool_decision_with_prose(self, orchestrator):
+        """Test parsing a tool decision wrapped in model prose."""
+        response = """Sure, here is my decision:
+{
+  "tools": ["compare_stocks([\\"AAPL\\", \\"MSFT\\"])", "get_market_news(5)"],
+  "reasoning": "Comparison requested"
+}
+Let me know if you need anything else."""
+
+        tools = orchestrator._parse_tool_decision(response)
+        
+        assert tools == ['compare_stocks(["AAPL", "MSFT"])', "get_market_news(5)"]
+    
+    def test_parse_tool_decision_invalid(self, orchestrator):
+        """Test parsing a response without a decision."""
+        assert orchestrator._parse_tool_decision("No tools needed.") == []
+    
+    def test_format_messages_for_llm(self, orchestrator):
+        """Test formatting history as one line per message."""
+        context = ConversationContext("test_user")
+        context.add_message("user", "Hello")
+        context.add_message("assistant", "Hi there")
+        
+        text = orchestrator._format_messages_for_llm(context.get_conversation_history())
+        
+        assert text == "User: Hello\nAssistant: Hi there"
+    
+    @pytest.mark.asyncio
+    async def test_execute_tools(self, orchestrator, mcp):
+        """Test executing parsed tool calls."""
+        results = await orchestrator._execute_tools([
+            'analyze_stock("AAPL")',
+            "compare_stocks(['AAPL', 'MSFT'])",
+            "get_market_news(5)"
+        ])
+        
+        assert ("analyze_stock", "AAPL") in mcp.calls
+        assert ("compare_stocks", ["AAPL", "MSFT"]) in mcp.calls
+        assert ("get_market_news", 5) in mcp.calls
+        assert results["analyze_stock_AAPL"]["symbol"] == "AAPL"
+        assert results["compare_stocks"]["symbols"] == ["AAPL", "MSFT"]
+    
+    @pytest.mark.asyncio
+    async def test_native_tool_calls(self, orchestrator, mcp):
+        """Test running native tool calls with dict and JSON string arguments."""
+        calls = orchestrator._native_tool_calls([
+            {"function": {"name": "analyze_stock", "arguments": {"symbol": "AAPL"}}},
+            {"function": {"name": "compare_stocks", "arguments": '{"symbols": ["AAPL", "MSFT"]}'}},
+            {"function": {"name": "get_market_news", "arguments": {"limit": "5"}}}
+        ])
+        
+        results = await orchestrator._run_tool_calls(calls)
+        
+        assert [label for label, _, _ in calls] == [
+            'analyze_stock("AAPL")',
+            'compare_stocks(["AAPL","MSFT"])',
+            'get_market_news("5")'
+        ]
+        assert mcp.calls == [
+            ("analyze_stock", "AAPL"),
+            ("compare_stocks", ["AAPL", "MSFT"]),
+            ("get_market_news", 5)
+        ]
+        assert set(results) == {"analyze_stock_AAPL", "compare_stocks", "market_news"}
+    
+    @pytest.mark.asyncio
+    async def test_native_tool_call_symbols_string(self, orchestrator, mcp):
+        """Test that comma-separated symbols are coerced to a list."""
+        calls = orchestrator._native_tool_calls([
+            {"function": {"name": "compare_stocks", "arguments": {"symbols": "AAPL, MSFT"}}}
+        ])
+        
+        await orchestrator._run_tool_calls(calls)
+        
+        assert mcp.calls == [("compare_stocks", ["AAPL", "MSFT"])]
+    
+    @pytest.mark.asyncio
+    async def test_unusable_native_tool_calls_are_logged(self, orchestrator, mcp, caplog):
+        """Test that unknown tools and bad arguments are dropped with a warning."""
+        calls = orchestrator._native_tool_calls([
+            {"function": {"name": "buy_stock", "arguments": {"symbol": "AAPL"}}},
+            {"function": {"name": "analyze_stock", "arguments": "{not json"}},
+            {"function": {"name": "analyze_stock", "arguments": {"ticker": "AAPL"}}}
+        ])
+        
+        results = await orchestrator._run_tool_calls(calls)
+        
+        assert len(calls) == 1
+        assert results == {}
+        assert mcp.calls == []
+        assert len([r for r in caplog.records if r.levelname == "WARNING"]) == 3
+    
+    @pytest.mark.asyncio
+    async def test_context_lru_overflow(self, orchestrator):
+        """Test that the least recently used context is evicted past the bound."""
+        orchestrator.max_contexts = 2
+        await orchestrator.get_or_create_context("alice")
+        await orchestrator.get_or_create_context("bob")
+        await orchestrator.get_or_create_context("alice")
+        await orchestrator.get_or_create_context("carol")
+        
+        assert list(orchestrator.contexts) == ["alice", "carol"]
+    
+    @pytest.mark.asyncio
+    async def test_evict_idle_contexts(self, orchestrator):
+        """Test that only contexts idle past the timeout are evicted."""
+        idle = await orchestrator.get_or_create_context("idle")
+        await orchestrator.get_or_create_context("active")
+        idle.last_activity -= timedelta(seconds=orchestrator.context_idle_timeout + 1)
+        
+        assert orchestrator.evict_idle_contexts() == 1
+        assert list(orchestrator.contexts) == ["active"]
+
+
+class TestAgentOrchestratorReplies:
+    """Tests for generating replies with tool calls."""
+    
+    @pytest.fixture
+    def mcp(self):
+        """Create an MCP server stub."""
+        return FakeMCPServer()
+    
+    @staticmethod
+    async def collect(orchestrator, message):
+        """Gather the chunks streamed for one message."""
+        return [chunk async for chunk in orchestrator.process_message_stream("alice", message)]
+    
+    @pytest.mark.asyncio
+    async def test_stream_without_tools_passes_deltas_through(self, mcp):
+        """Test that a no-tool reply is streamed as it arrives, in several chunks."""
+        ollama = FakeOllamaClient([{"content": "Hello"}, {"content": " there"}, {"content": "!"}])
+        orchestrator = AgentOrchestrator(ollama, mcp)
+        
+        chunks = await self.collect(orchestrator, "Hi")
+        
+        assert chunks == ["Hello", " there", "!"]
+        assert len(ollama.requests) == 1
+        assert mcp.calls == []
+        assert orchestrator.contexts["alice"].messages[-1].content == "Hello there!"
+    
+    @pytest.mark.asyncio
+    async def test_stream_with_native_tool_call(self, mcp):
+        """Test that tool calls in the stream run before the final answer is streamed."""
+        ollama = FakeOllamaClient([
+            {"content": ""},
+            {"content": "", "tool_calls": [
+                {"function": {"name": "analyze_stock", "arguments": {"symbol": "AAPL"}}}
+            ]}
+        ])
+        orchestrator = AgentOrchestrator(ollama, mcp)
+        
+        chunks = await self.collect(orchestrator, "How is Apple doing?")
+        
+        assert "".join(chunks) == "Final answer "
+        assert mcp.calls == [("analyze_stock", "AAPL")]
+        assert [message["role"] for message in ollama.requests[-1]] == [
+            "system", "user", "assistant", "tool"
+        ]
+        assert orchestrator.contexts["alice"].messages[-1].metadata["tool_count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stream_holds_back_json_tool_decision(self, mcp):
+        """Test that a tool decision in the content is not streamed to the client."""
+        ollama = FakeOllamaClient([
+            {"content": '{"tools": ["get_market_news(5)"],'},
+            {"content": ' "reasoning": "News requested"}'}
+        ])
+        orchestrator = AgentOrchestrator(ollama, mcp)
+        
+        chunks = await self.collect(orchestrator, "Any market news?")
+        
+        assert "".join(chunks) == "Final answer "
+        assert mcp.calls == [("get_market_news", 5)]
+    
+    @pytest.mark.asyncio
+    async def test_process_message_with_native_tool_call(self, mcp):
+        """Test that a non-streamed turn runs native tool calls and answers once."""
+        ollama = FakeOllamaClient([
+            {"content": "", "tool_calls": [
+                {"function": {"name": "compare_stocks", "arguments": {"symbols": ["AAPL", "MSFT"]}}}
+            ]}
+        ])
+        orchestrator = AgentOrchestrator(ollama, mcp)
+        
+        result = await orchestrator.process_message("alice", "Compare Apple and Microsoft")
+        
+        assert result["success"]
+        assert result["response"] == "Final answer"
+        assert result["tools_used"] == ['compare_stocks(["AAPL","MSFT"])']
+        assert mcp.calls == [("compare_stocks", ["AAPL", "MSFT"])]
+        assert len(ollama.requests) == 2
@@ -0,0 +1,55 @@
+"""
+Unit tests for the API routes.
+
+Tests the cached Ollama health probe.
+"""
+
+import time
+import pytest
+from src.api import routes
+
+
+class FakeOllamaClient:
+    """Ollama client stub counting health checks."""
+    
+    def __init__(self, available):
+        self.available = available
+        self.checks = 0
+    
+    async def health_check(self):
+        self.checks += 1
+        return self.available
+
+
+class TestOllamaHealthCache:
+    """Tests for the cached Ollama availability check."""
+    
+    @pytest.fixture
+    def ollama(self, monkeypatch):
+        """Install an Ollama stub and start from an expired health result."""
+        client = FakeOllamaClient(available=True)
+        monkeypatch.setattr(routes, "ollama_client", client)
+        monkeypatch.setattr(routes, "_ollama_health", (0.0, False))
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_fresh_result_is_reused(self, ollama):
+        """Test that a result within the TTL is served without probing Ollama."""
+        assert await routes._check_ollama() is True
+        
+        ollama.available = False
+        
+        assert await routes._check_ollama() is True
+        assert ollama.checks == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_result_is_refreshed(self, ollama, monkeypatch):
+        """Test that a result past the TTL triggers a new probe."""
+        assert await routes._check_ollama() is True
+        
+        ollama.available = False
+        _, available = routes._ollama_health
+        monkeypatch.setattr(routes, "_ollama_health", (time.monotonic() - 1, available))
+        
+        assert await routes._check_ollama() is False
+        assert ollama.checks == 2
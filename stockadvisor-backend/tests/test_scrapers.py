@@ -0,0 +1,309 @@
+"""
+Unit tests for the stock and news scrapers.
+
+Tests request coalescing, retries, chart parsing and symbol matching.
+"""
+
+import asyncio
+import diskcache
+import httpx
+import numpy as np
+import pytest
+import pytest_asyncio
+from src.mcp.tools import scraper_news, scraper_stock
+from src.mcp.tools.scraper_news import NewsScraper
+from src.mcp.tools.scraper_stock import StockScraper
+from src.utils.config import config
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Markets</title>
+<item><title>AAPL and MSFT rally</title><summary>GOOGL lags</summary></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """Point the scrapers' disk caches at a temporary directory."""
+    def open_disk_cache(name):
+        return diskcache.Cache(str(tmp_path / name))
+    
+    monkeypatch.setattr(scraper_stock, "open_disk_cache", open_disk_cache)
+    monkeypatch.setattr(scraper_news, "open_disk_cache", open_disk_cache)
+
+
+def use_transport(scraper, handler):
+    """Route a stock scraper's requests to a handler, recording them."""
+    requests = []
+    
+    def record(request):
+        requests.append(request)
+        return handler(request)
+    
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    return requests
+
+
+def chart_payload(adjclose=True):
+    """Build a v8 chart response with one null candle."""
+    result = {
+        "meta": {"symbol": "AAPL"},
+        "timestamp": [1700000000, 1700086400, 1700172800],
+        "indicators": {
+            "quote": [{
+                "open": [1.0, None, 3.0],
+                "high": [2.0, None, 4.0],
+                "low": [0.5, None, 2.0],
+                "close": [1.5, None, 3.5],
+                "volume": [100, None, 300]
+            }]
+        }
+    }
+    if adjclose:
+        result["indicators"]["adjclose"] = [{"adjclose": [1.4, None, 3.4]}]
+    
+    return {"chart": {"result": [result], "error": None}}
+
+
+class TestStockScraper:
+    """Tests for StockScraper request coalescing."""
+    
+    @pytest_asyncio.fixture
+    async def scraper(self, disk_cache):
+        """Create a stock scraper backed by a temporary disk cache."""
+        scraper = StockScraper()
+        yield scraper
+        await scraper.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self, scraper):
+        """Test that concurrent misses for one key make a single request."""
+        calls = 0
+        
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"price": 100}
+        
+        results = await asyncio.gather(
+            *(scraper._cached_fetch("quote:AAPL", 60, fetch) for _ in range(5))
+        )
+        
+        assert calls == 1
+        assert results == [{"price": 100}] * 5
+        assert scraper._disk.get("quote:AAPL") == {"price": 100}
+    
+    @pytest.mark.asyncio
+    async def test_cancelling_first_caller_keeps_fetch_alive(self, scraper):
+        """Test that cancelling the caller that started a fetch spares the others."""
+        release = asyncio.Event()
+        
+        async def fetch():
+            await release.wait()
+            return {"price": 100}
+        
+        first = asyncio.create_task(scraper._cached_fetch("quote:AAPL", 60, fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(scraper._cached_fetch("quote:AAPL", 60, fetch))
+        await asyncio.sleep(0)
+        
+        first.cancel()
+        release.set()
+        
+        assert await second == {"price": 100}
+        assert first.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_intraday_history_expires_sooner(self, scraper, monkeypatch):
+        """Test that intraday periods are cached far shorter than daily ones."""
+        ttls = {}
+        
+        async def cached_fetch(key, ttl, fetch):
+            ttls[key] = ttl
+            return {}
+        
+        monkeypatch.setattr(scraper, "_cached_fetch", cached_fetch)
+        
+        await scraper.get_historical_data("AAPL", "1d")
+        await scraper.get_historical_data("AAPL", "1y")
+        
+        assert ttls["history:AAPL:1d"] == 60
+        assert ttls["history:AAPL:1y"] == config.HISTORY_CACHE_TTL
+
+
+
+class TestStockScraperRetries:
+    """Tests for StockScraper retry and backoff."""
+    
+    @pytest_asyncio.fixture
+    async def scraper(self, disk_cache):
+        """Create a stock scraper backed by a temporary disk cache."""
+        scraper = StockScraper()
+        yield scraper
+        await scraper.aclose()
+    
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        """Record backoff delays instead of waiting them out."""
+        delays = []
+        sleep = asyncio.sleep
+        
+        async def record(delay):
+            delays.append(delay)
+            await sleep(0)
+        
+        monkeypatch.setattr(asyncio, "sleep", record)
+        return delays
+    
+    def test_retry_delay_honours_retry_after(self):
+        """Test that Retry-After is used as the delay, capped at the maximum."""
+        assert StockScraper._retry_delay(0, httpx.Response(429, headers={"Retry-After": "7"})) == 7
+        assert StockScraper._retry_delay(0, httpx.Response(429, headers={"Retry-After": "120"})) == 30
+    
+    def test_retry_delay_backoff_is_capped(self):
+        """Test that exponential backoff stops growing at the maximum."""
+        assert 4 <= StockScraper._retry_delay(2) < 5
+        assert 30 <= StockScraper._retry_delay(10) < 31
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, scraper, sleeps):
+        """Test that a 429 is retried after its Retry-After delay."""
+        responses = iter([
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"ok": True})
+        ])
+        requests = use_transport(scraper, lambda request: next(responses))
+        
+        response = await scraper._get("https://example.test/quote", {})
+        
+        assert response.json() == {"ok": True}
+        assert len(requests) == 2
+        assert sleeps == [2.0]
+    
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_retried(self, scraper, sleeps):
+        """Test that a non-retryable 4xx fails on the first attempt."""
+        requests = use_transport(scraper, lambda request: httpx.Response(404))
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await scraper._get("https://example.test/quote", {})
+        
+        assert len(requests) == 1
+        assert sleeps == []
+    
+    @pytest.mark.asyncio
+    async def test_transport_error_gives_up_after_max_retries(self, scraper, sleeps):
+        """Test that connection failures are retried MAX_RETRIES times, then raised."""
+        def refuse(request):
+            raise httpx.ConnectError("connection refused", request=request)
+        
+        requests = use_transport(scraper, refuse)
+        
+        with pytest.raises(httpx.ConnectError):
+            await scraper._get("https://example.test/quote", {})
+        
+        assert len(requests) == config.MAX_RETRIES + 1
+        assert len(sleeps) == config.MAX_RETRIES
+
+
+
+class TestStockScraperChart:
+    """Tests for parsing Yahoo chart payloads."""
+    
+    @pytest_asyncio.fixture
+    async def scraper(self, disk_cache):
+        """Create a stock scraper backed by a temporary disk cache."""
+        scraper = StockScraper()
+        yield scraper
+        await scraper.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_null_candles(self, scraper):
+        """Test that null prices become NaN and null volume becomes 0."""
+        requests = use_transport(scraper, lambda request: httpx.Response(200, json=chart_payload()))
+        
+        data = await scraper._fetch_historical_data("AAPL", "1y")
+        
+        assert requests[0].url.params["range"] == "1y"
+        assert requests[0].url.params["interval"] == "1d"
+        assert data["dates"] == ["2023-11-14", "2023-11-15", "2023-11-16"]
+        assert data["count"] == 3
+        assert np.isnan(data["open"][1]) and np.isnan(data["close"][1])
+        assert data["adj_close"].tolist()[::2] == [1.4, 3.4]
+        assert data["volume"].dtype == np.int64
+        assert data["volume"].tolist() == [100, 0, 300]
+    
+    @pytest.mark.asyncio
+    async def test_missing_adjclose_falls_back_to_close(self, scraper):
+        """Test that intraday payloads without adjclose reuse the close column."""
+        use_transport(scraper, lambda request: httpx.Response(200, json=chart_payload(adjclose=False)))
+        
+        data = await scraper._fetch_historical_data("AAPL", "5d")
+        
+        np.testing.assert_array_equal(data["adj_close"], data["close"])
+        assert data["adj_close"] is not data["close"]
+        assert data["dates"][0] == "2023-11-14T22:13"
+    
+    @pytest.mark.asyncio
+    async def test_empty_chart_raises(self, scraper):
+        """Test that a chart without candles is reported as missing data."""
+        use_transport(
+            scraper,
+            lambda request: httpx.Response(200, json={"chart": {"result": None, "error": {}}})
+        )
+        
+        with pytest.raises(ValueError):
+            await scraper._fetch_historical_data("AAPL", "1y")
+
+
+class TestNewsScraper:
+    """Tests for NewsScraper feed coalescing."""
+    
+    @pytest_asyncio.fixture
+    async def scraper(self, disk_cache):
+        """Create a news scraper backed by a temporary disk cache."""
+        scraper = NewsScraper()
+        yield scraper
+        await scraper.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_fetch_each_feed_once(self, scraper, monkeypatch):
+        """Test that concurrent symbol lookups on a cold cache share feed downloads."""
+        fetched = []
+        
+        async def fetch(url):
+            fetched.append(url)
+            await asyncio.sleep(0.01)
+            return RSS_FEED
+        
+        monkeypatch.setattr(scraper, "_fetch", fetch)
+        
+        results = await asyncio.gather(
+            *(scraper.get_news_for_symbol(symbol) for symbol in ("AAPL", "MSFT", "GOOGL"))
+        )
+        
+        assert sorted(fetched) == sorted(scraper.rss_feeds.values())
+        assert all(result["count"] == len(scraper.rss_feeds) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_symbol_matches_whole_words_only(self, scraper, monkeypatch):
+        """Test that a symbol matches case-insensitively but not inside longer tickers."""
+        feed = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Markets</title>
+<item><title>AAPLX fund launches</title><summary>No match here</summary></item>
+<item><title>Shares of aapl climb</title><summary>Apple rallies</summary></item>
+<item><title>Tech update</title><summary>Gains for (AAPL), MSFT</summary></item>
+</channel></rss>"""
+        
+        async def fetch(url):
+            return feed
+        
+        monkeypatch.setattr(scraper, "_fetch", fetch)
+        monkeypatch.setattr(scraper, "rss_feeds", {"markets": "https://example.test/rss"})
+        
+        news = await scraper.get_news_for_symbol("AAPL")
+        
+        assert [article["title"] for article in news["articles"]] == [
+            "Shares of aapl climb",
+            "Tech update"
+        ]
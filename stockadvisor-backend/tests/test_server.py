@@ -0,0 +1,58 @@
+"""
+Unit tests for the MCP server.
+
+Tests stock analysis over stubbed scrapers.
+"""
+
+import diskcache
+import numpy as np
+import pytest
+import pytest_asyncio
+from src.mcp.server import MCPServer
+from src.mcp.tools import scraper_news, scraper_stock
+
+
+class TestMCPServer:
+    """Tests for MCPServer."""
+    
+    @pytest_asyncio.fixture
+    async def server(self, tmp_path, monkeypatch):
+        """Create an MCP server with disk caches in a temporary directory."""
+        def open_disk_cache(name):
+            return diskcache.Cache(str(tmp_path / name))
+        
+        monkeypatch.setattr(scraper_stock, "open_disk_cache", open_disk_cache)
+        monkeypatch.setattr(scraper_news, "open_disk_cache", open_disk_cache)
+        
+        async with MCPServer() as server:
+            yield server
+    
+    @staticmethod
+    def stub_scrapers(server, monkeypatch, closes):
+        """Serve fixed closing prices and no news to the server."""
+        async def get_stock_data(symbol):
+            return {"symbol": symbol, "price": closes[-1]}
+        
+        async def get_historical_data(symbol, period="1y"):
+            return {"symbol": symbol, "close": np.asarray(closes, dtype=np.float64)}
+        
+        async def get_news_for_symbol(symbol, limit=10):
+            return {"symbol": symbol, "articles": []}
+        
+        monkeypatch.setattr(server.stock_scraper, "get_stock_data", get_stock_data)
+        monkeypatch.setattr(server.stock_scraper, "get_historical_data", get_historical_data)
+        monkeypatch.setattr(server.news_scraper, "get_news_for_symbol", get_news_for_symbol)
+    
+    @pytest.mark.asyncio
+    async def test_reported_rsi_reflects_recent_rally(self, server, monkeypatch):
+        """Test that the reported RSI follows the latest prices, not the oldest."""
+        # A year of decline followed by a month-long rally
+        closes = list(np.linspace(200.0, 100.0, 230)) + list(np.linspace(101.0, 140.0, 22))
+        self.stub_scrapers(server, monkeypatch, closes)
+        
+        result = await server.analyze_stock("AAPL")
+        rsi = result["report"]["technical_analysis"]["rsi"]
+        
+        assert result["success"]
+        assert rsi > 70
+        assert server.technical_analyzer.calculate_rsi(closes) < 30
@@ -0,0 +1,76 @@
+"""
+Unit tests for the Redis context store.
+
+Tests that summary refreshes and concurrent turns do not overwrite each other.
+"""
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from src.agent.context import ConversationContext
+from src.agent.orchestrator import AgentOrchestrator
+from src.agent.store import RedisContextStore
+
+
+class FakeOllamaClient:
+    """Ollama client stub returning a fixed summary."""
+    
+    async def generate(self, prompt, temperature=0.7, max_tokens=None):
+        return "User is tracking AAPL."
+
+
+class TestRedisContextStore:
+    """Tests for RedisContextStore."""
+    
+    @pytest_asyncio.fixture
+    async def store(self):
+        """Create a context store backed by an in-memory Redis."""
+        store = RedisContextStore(url="redis://localhost")
+        store.redis = fakeredis.aioredis.FakeRedis()
+        yield store
+        await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_save_and_load(self, store):
+        """Test that a saved context and its summary load back."""
+        context = ConversationContext("test_user")
+        context.add_message("user", "Hello")
+        await store.save(context)
+        await store.save_summary("test_user", "Greeting only.")
+        
+        loaded = await store.load("test_user")
+        
+        assert loaded.messages[0].content == "Hello"
+        assert loaded.session_summary == "Greeting only."
+    
+    @pytest.mark.asyncio
+    async def test_turn_saved_after_refresh_keeps_summary(self, store):
+        """Test that a turn loaded before a summary refresh does not erase it."""
+        orchestrator = AgentOrchestrator(FakeOllamaClient(), None, store)
+        await store.save(ConversationContext("test_user"))
+        
+        # A turn loads the context, then a refresh finishes before it saves
+        turn_context = await orchestrator.get_or_create_context("test_user")
+        turn_context.add_message("user", "How is AAPL doing?")
+        refresh_context = await store.load("test_user")
+        await orchestrator._refresh_summary(refresh_context)
+        await orchestrator._finish_turn(turn_context, "AAPL is up 2% today.")
+        
+        loaded = await store.load("test_user")
+        
+        assert loaded.session_summary == "User is tracking AAPL."
+        assert [message.content for message in loaded.messages] == [
+            "How is AAPL doing?",
+            "AAPL is up 2% today."
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_summary(self, store):
+        """Test that deleting a context also drops its summary."""
+        await store.save(ConversationContext("test_user"))
+        await store.save_summary("test_user", "Greeting only.")
+        
+        await store.delete("test_user")
+        
+        assert await store.load("test_user") is None
+        assert await store.redis.exists("summary:test_user") == 0